@@ -0,0 +1,83 @@
+"""
+Import-time and memory benchmark for the translator's entry points.
+
+Each scenario imports a module in a fresh interpreter and reports the median
+wall time, peak RSS and whether any module that scenario must not load (other
+providers' SDKs, chromadb, PDF loaders) ended up in sys.modules. Exits with
+status 1 on a forbidden import or when --max-seconds is exceeded, so it can
+guard against an eager import creeping back in.
+
+    python benchmarks/bench_import.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROVIDER_SDKS = ["langchain_openai", "langchain_anthropic", "langchain_ollama", "openai", "anthropic", "ollama"]
+VECTOR_STORE = ["langchain_chroma", "chromadb"]
+PDF_LOADERS = ["pymupdf", "fitz"]
+
+# (name, module to import, LLM_PROVIDER, modules that must stay unloaded)
+SCENARIOS = [
+    ("config", "src.config", "openai", PROVIDER_SDKS + VECTOR_STORE + PDF_LOADERS),
+    ("cli", "main", "openai", PROVIDER_SDKS + VECTOR_STORE + PDF_LOADERS),
+    ("telemetry", "src.telemetry", "openai", PROVIDER_SDKS + VECTOR_STORE + PDF_LOADERS),
+    ("processor", "src.db_processor", "ollama", PROVIDER_SDKS + VECTOR_STORE + PDF_LOADERS),
+    ("ingest", "src.ingest", "openai", PROVIDER_SDKS + VECTOR_STORE + PDF_LOADERS),
+]
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import importlib
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - started
+forbidden = [name for name in sys.argv[2:] if name in sys.modules]
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "forbidden": forbidden,
+}))
+"""
+
+def probe(module: str, provider: str, forbidden) -> dict:
+    env = {**os.environ, "LLM_PROVIDER": provider}
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, module, *forbidden],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Translator import-time benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per scenario")
+    parser.add_argument("--max-seconds", type=float, help="Fail if a scenario's median exceeds this")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    failed = False
+
+    print(f"{'scenario':<10} {'module':<18} {'median (s)':>10} {'rss (MB)':>9} {'modules':>8}  forbidden")
+    for name, module, provider, forbidden in SCENARIOS:
+        samples = [probe(module, provider, forbidden) for _ in range(args.runs)]
+        seconds = statistics.median(sample["seconds"] for sample in samples)
+        rss = statistics.median(sample["rss_mb"] for sample in samples)
+        loaded = samples[-1]["forbidden"]
+        print(
+            f"{name:<10} {module:<18} {seconds:>10.3f} {rss:>9.1f} {samples[-1]['modules']:>8}  "
+            f"{', '.join(loaded) or '-'}"
+        )
+        if loaded or (args.max_seconds and seconds > args.max_seconds):
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+End-to-end throughput benchmark for the translation processor.
+
+Seeds N synthetic articles, translates them with the offline `fake` provider at
+each concurrency level and reports articles/min. Requires DATABASE_URL; the
+synthetic rows and their telemetry are deleted afterwards.
+
+    python benchmarks/bench_processor.py --articles 50 --concurrency 1 4 8 16
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Translator throughput benchmark (fake provider)")
+    parser.add_argument("--articles", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean time to first token (s)")
+    parser.add_argument("--latency-stddev", type=float, default=0.1)
+    parser.add_argument("--distribution", choices=["normal", "exponential", "fixed"], default="normal")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--output-tokens", type=int, default=400)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--no-streaming", action="store_true", help="Use the non-streaming translate_text path")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "FAKE_LATENCY_MEAN": str(args.latency),
+        "FAKE_LATENCY_STDDEV": str(args.latency_stddev),
+        "FAKE_LATENCY_DISTRIBUTION": args.distribution,
+        "FAKE_TOKENS_PER_SECOND": str(args.tokens_per_second),
+        "FAKE_OUTPUT_TOKENS": str(args.output_tokens),
+        "FAKE_FAILURE_RATE": str(args.failure_rate),
+        "FAKE_SEED": "1234",
+        "TRANSLATION_STREAMING": str(not args.no_streaming).lower(),
+    })
+
+    import logging
+    from sqlalchemy import delete, select
+
+    from seed import seed_synthetic
+    from src.db import Article, TranslationMetric, get_session, init_db
+    from src.db_processor import process_pending
+
+    logging.getLogger("src.db_processor").setLevel(logging.WARNING)
+    init_db()
+
+    print(f"{'concurrency':>11} {'articles':>8} {'failed':>6} {'wall (s)':>9} {'articles/min':>12} {'p50 (s)':>8} {'p95 (s)':>8}")
+    for concurrency in args.concurrency:
+        prefix = f"bench-c{concurrency}-"
+        ids = seed_synthetic(args.articles, prefix=prefix)
+
+        started = time.perf_counter()
+        succeeded, failed = process_pending(concurrency=concurrency, only_ids=ids)
+        wall = time.perf_counter() - started
+
+        session = get_session()
+        try:
+            latencies = sorted(session.execute(
+                select(TranslationMetric.latency).where(TranslationMetric.article_id.in_(ids))
+            ).scalars().all())
+            session.execute(delete(TranslationMetric).where(TranslationMetric.article_id.in_(ids)))
+            session.execute(delete(Article).where(Article.id.in_(ids)))
+            session.commit()
+        finally:
+            session.close()
+
+        p50 = statistics.median(latencies) if latencies else 0.0
+        p95 = latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+        print(
+            f"{concurrency:>11} {succeeded:>8} {failed:>6} {wall:>9.2f} "
+            f"{succeeded / wall * 60:>12.1f} {p50:>8.2f} {p95:>8.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,63 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from src.ingest import ingest_paper
-from src.rag import query_rag
-
+# Commands import what they need, so e.g. `stats` never loads the LLM or vector store SDKs
 def main():
     parser = argparse.ArgumentParser(description="AI Translator & Summarizer for Scientific Papers")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     file_parser = subparsers.add_parser("file", help="File related commands")
     file_parser.add_argument("file_path", help="Path to the PDF file")
+    file_parser.add_argument("--article-id", help="Article ID for the indexed chunks (default: file name)")
+
+    ingest_parser = subparsers.add_parser("ingest", help="Bulk-index PDFs into the vector store")
+    source_group = ingest_parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument("--dir", help="Directory scanned recursively for PDFs")
+    source_group.add_argument("--glob", help="Glob pattern of PDFs (e.g. 'articles_pdf/*.pdf')")
+    source_group.add_argument("--from-db", action="store_true", help="Every article with original_pdf_path in the DB")
+    ingest_parser.add_argument("--pdf-root", help="Base directory for relative original_pdf_path values")
+    ingest_parser.add_argument("--reparse", action="store_true", help="With --from-db, parse the PDFs even when full_text is stored")
+    ingest_parser.add_argument("--workers", type=int, help="Parser processes (default: all cores)")
+    ingest_parser.add_argument("--batch-size", type=int, help="Chunks per vector store write")
+    ingest_parser.add_argument("--prune", action="store_true", help="With --from-db, also remove indexed articles no longer in the DB")
+
+    delete_parser = subparsers.add_parser("delete", help="Remove articles from the vector store")
+    delete_parser.add_argument("--article-id", action="append", required=True, help="Article to remove (repeatable)")
     
     db_parser = subparsers.add_parser("db", help="Database related commands (Process pending articles)")
     db_parser.add_argument("--loop", action="store_true", help="Run in continuous loop mode")
+    db_parser.add_argument("--poll-interval", type=float, help="Fallback re-scan interval in seconds while waiting for NOTIFY (default: TRANSLATION_POLL_INTERVAL)")
+    db_parser.add_argument("--token-budget", type=int, help="Estimated tokens to spend per pass, highest-priority articles first (default: TRANSLATION_TOKEN_BUDGET)")
+    db_parser.add_argument("--concurrency", type=int, help="Articles translated in parallel (default: TRANSLATION_CONCURRENCY)")
+
+    serve_parser = subparsers.add_parser("serve", help="Run the warm RAG query service (HTTP or UNIX socket)")
+    serve_parser.add_argument("--host", help="Bind address (default: RAG_SERVICE_HOST)")
+    serve_parser.add_argument("--port", type=int, help="Port (default: RAG_SERVICE_PORT)")
+    serve_parser.add_argument("--socket", help="Listen on this UNIX socket path instead of TCP")
+
+    variants_parser = subparsers.add_parser("variants", help="Backfill per-audience versions (TRANSLATION_AUDIENCES)")
+    variants_parser.add_argument("--article-id", action="append", help="Only this article (repeatable; default: all missing)")
+
+    requeue_parser = subparsers.add_parser("requeue", help="Re-queue dead-lettered translations")
+    requeue_parser.add_argument("--article-id", action="append", help="Only this article (repeatable; default: all)")
+    requeue_parser.add_argument("--list", action="store_true", help="List dead letters without re-queueing")
+
+    stats_parser = subparsers.add_parser("stats", help="Translation throughput, latency and cost report")
+    stats_parser.add_argument("--hours", type=float, default=24, help="Rolling window in hours")
 
     args = parser.parse_args()
+    if args.command == "ingest" and args.prune and not args.from_db:
+        parser.error("--prune requires --from-db")
     
     if args.command == "file":
         try:
             from src.ingest import ingest_paper
-            result = ingest_paper(args.file_path)
+            from src.rag import query_rag
+            from src.vectorstore import article_id_from_path
+            article_id = args.article_id or article_id_from_path(args.file_path)
+            result = ingest_paper(args.file_path, article_id=article_id)
             print(result)
             print("Processando consulta...")
-            answer = query_rag()
+            answer = query_rag(article_id=article_id)
             print("\n=== Resposta ===\n")
             print(answer)
             print("\n=============\n")
@@ -32,14 +68,100 @@ def main():
             print(f"Erro durante o processamento: {e}")
             sys.exit(1)
             
+    elif args.command == "ingest":
+        try:
+            from src.ingest import (
+                article_ids_from_db, collect_pdf_paths, full_texts_from_db, pdf_paths_from_db, ingest_corpus, prune_articles
+            )
+            texts = None
+            if args.from_db:
+                paths = pdf_paths_from_db(pdf_root=args.pdf_root)
+                if not args.reparse:
+                    texts = full_texts_from_db()
+            else:
+                paths = collect_pdf_paths(directory=args.dir, pattern=args.glob)
+            print(ingest_corpus(paths, workers=args.workers, batch_size=args.batch_size, texts=texts))
+            if args.prune:
+                print(prune_articles(article_ids_from_db()))
+        except Exception as e:
+            print(f"Erro durante a ingestão: {e}")
+            sys.exit(1)
+
+    elif args.command == "delete":
+        try:
+            from src.vectorstore import delete_article, get_vectorstore
+            vector_store = get_vectorstore()
+            for article_id in args.article_id:
+                print(f"{article_id}: {delete_article(vector_store, article_id)} chunks removidos")
+        except Exception as e:
+            print(f"Erro ao remover artigos: {e}")
+            sys.exit(1)
+
     elif args.command == "db":
         try:
             from src.db_processor import process_articles
-            process_articles(loop=args.loop)
+            process_articles(
+                loop=args.loop,
+                sleep_interval=args.poll_interval,
+                concurrency=args.concurrency,
+                token_budget=args.token_budget
+            )
         except Exception as e:
             print(f"Error during database processing: {e}")
             sys.exit(1)
 
+    elif args.command == "serve":
+        try:
+            import logging
+            from src.service import serve
+            logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+            serve(host=args.host, port=args.port, socket_path=args.socket)
+        except Exception as e:
+            print(f"Error running the RAG service: {e}")
+            sys.exit(1)
+
+    elif args.command == "variants":
+        try:
+            from src.db import init_db
+            from src.db_processor import process_variants
+            init_db()
+            print(f"Generated audience variants for {process_variants(args.article_id)} articles.")
+        except Exception as e:
+            print(f"Error generating audience variants: {e}")
+            sys.exit(1)
+
+    elif args.command == "requeue":
+        try:
+            from src.db import get_session, init_db
+            from src.db_processor import dead_letters, requeue_dead_letters
+            init_db()
+            if args.list:
+                session = get_session()
+                try:
+                    for article in dead_letters(session):
+                        print(f"{article.id} ({article.translation_attempts} attempts): {article.last_error}")
+                finally:
+                    session.close()
+            else:
+                print(f"Re-queued {requeue_dead_letters(args.article_id)} dead-lettered articles.")
+        except Exception as e:
+            print(f"Error re-queueing articles: {e}")
+            sys.exit(1)
+
+    elif args.command == "stats":
+        try:
+            from src.db import get_session, init_db
+            from src.telemetry import throughput_report, format_report
+            init_db()
+            session = get_session()
+            try:
+                print(format_report(throughput_report(session, hours=args.hours), args.hours))
+            finally:
+                session.close()
+        except Exception as e:
+            print(f"Error building telemetry report: {e}")
+            sys.exit(1)
+
     else:
         parser.print_help()
         sys.exit(1)
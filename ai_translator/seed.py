@@ -1,5 +1,7 @@
 import os
 import sys
+import argparse
+import random
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from src.db import Article, Base
@@ -51,5 +53,49 @@ def seed():
     session.commit()
     print("Seeding complete.")
 
+SYNTHETIC_SECTIONS = ["Abstract", "Introduction", "Related Work", "Methodology", "Experiments", "Results", "Discussion", "Conclusion"]
+SYNTHETIC_WORDS = "model data training results method accuracy network baseline evaluation dataset performance approach analysis learning system experiment".split()
+
+def synthetic_full_text(rng: random.Random, paragraphs_per_section: int = 6) -> str:
+    sections = []
+    for section in SYNTHETIC_SECTIONS:
+        paragraphs = [
+            " ".join(rng.choice(SYNTHETIC_WORDS) for _ in range(rng.randint(80, 160))).capitalize() + "."
+            for _ in range(paragraphs_per_section)
+        ]
+        sections.append(f"{section}:\n" + "\n\n".join(paragraphs))
+    return "\n\n".join(sections)
+
+def seed_synthetic(count: int, prefix: str = "synthetic-", paragraphs_per_section: int = 6, seed_value: int = 42) -> list:
+    """Inserts `count` pending synthetic articles (for load tests) and returns their IDs."""
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed_value)
+    session = Session()
+    try:
+        ids = [f"{prefix}{i:05d}" for i in range(count)]
+        session.query(Article).filter(Article.id.in_(ids)).delete(synchronize_session=False)
+        session.add_all(
+            Article(
+                id=article_id,
+                title=f"Synthetic paper {article_id}",
+                full_text=synthetic_full_text(rng, paragraphs_per_section),
+                simplified_text=None,
+                processing_status="parsed",
+                relevance_score=rng.uniform(0, 50),
+            )
+            for article_id in ids
+        )
+        session.commit()
+        return ids
+    finally:
+        session.close()
+
 if __name__ == "__main__":
-    seed()
+    parser = argparse.ArgumentParser(description="Seed the articles table")
+    parser.add_argument("--synthetic", type=int, help="Insert N synthetic pending articles instead of the test article")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        print(f"Inserted {len(seed_synthetic(args.synthetic))} synthetic articles.")
+    else:
+        seed()
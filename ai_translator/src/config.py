@@ -1,19 +1,24 @@
+import asyncio
 import os
+import threading
 from enum import Enum
 from functools import lru_cache
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
 
+import httpx
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_anthropic import ChatAnthropic
-from langchain_ollama import ChatOllama, OllamaEmbeddings
-from langchain_core.embeddings import Embeddings
-from langchain_core.language_models import BaseChatModel
+
+# Provider SDKs are imported inside the factories below, so a process only
+# loads the one selected by LLM_PROVIDER (see benchmarks/bench_import.py)
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+    from langchain_core.language_models import BaseChatModel
 
 class LLMProvider(str, Enum):
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
     OLLAMA = "ollama"
+    FAKE = "fake"
 
 class Settings(BaseSettings):
     LLM_PROVIDER: LLMProvider = LLMProvider.OPENAI
@@ -25,6 +30,58 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4o"
     ANTHROPIC_MODEL: str = "claude-3-opus-20240229"
     DATABASE_URL: Optional[str] = None
+    OPENAI_EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    OLLAMA_EMBEDDING_MODEL: str = "nomic-embed-text"
+    EMBEDDING_CACHE_DIR: str = "./embedding_cache"
+    EMBEDDING_BATCH_SIZE: int = 256
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024
+    INGEST_BATCH_SIZE: int = 2000
+    PDF_PARALLEL_MIN_PAGES: int = 64
+    PDF_PARSE_WORKERS: Optional[int] = None
+    CONTEXT_TOKEN_BUDGET: int = 6000
+    CONTEXT_CHUNKS_PER_SECTION: int = 6
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    HTTP_TIMEOUT: float = 120.0
+    FAKE_LATENCY_MEAN: float = 0.5
+    FAKE_LATENCY_STDDEV: float = 0.1
+    FAKE_LATENCY_DISTRIBUTION: str = "normal"
+    FAKE_TOKENS_PER_SECOND: float = 80.0
+    FAKE_OUTPUT_TOKENS: int = 600
+    FAKE_FAILURE_RATE: float = 0.0
+    FAKE_SEED: Optional[int] = None
+    FAKE_EMBEDDING_SIZE: int = 256
+    TRANSLATION_STREAMING: bool = True
+    TRANSLATION_CONCURRENCY: int = 1
+    TRANSLATION_AUDIENCES: str = ""
+    TRANSLATION_TOKEN_BUDGET: Optional[int] = None
+    TRANSLATION_OUTPUT_TOKENS_ESTIMATE: int = 1500
+    PRIORITY_RELEVANCE_WEIGHT: float = 1.0
+    PRIORITY_AGE_WEIGHT: float = 0.05
+    PRIORITY_DEADLINE_BOOST: float = 50.0
+    PRIORITY_DEADLINE_HORIZON: float = 48.0
+    DIGEST_WEEKDAY: int = 0
+    DIGEST_HOUR: int = 9
+    DIGEST_WINDOW_DAYS: int = 7
+    RAG_SERVICE_HOST: str = "127.0.0.1"
+    RAG_SERVICE_PORT: int = 8765
+    STREAM_FLUSH_INTERVAL: float = 5.0
+    LLM_ROUTING: bool = False
+    ROUTER_PROVIDERS: str = "openai,anthropic,ollama"
+    OPENAI_FAST_MODEL: Optional[str] = "gpt-4o-mini"
+    ANTHROPIC_FAST_MODEL: Optional[str] = "claude-3-haiku-20240307"
+    OLLAMA_FAST_MODEL: Optional[str] = None
+    FAKE_FAST_MODEL: Optional[str] = None
+    ROUTER_SHORT_PAPER_TOKENS: int = 3000
+    ROUTER_CONCURRENCY: Dict[str, int] = {"openai": 8, "anthropic": 4, "ollama": 1, "fake": 64}
+    ROUTER_WINDOW: int = 50
+    ROUTER_COOLDOWN: float = 60.0
+    TRANSLATION_MAX_ATTEMPTS: int = 5
+    RETRY_BACKOFF_BASE: float = 120.0
+    RETRY_BACKOFF_MAX: float = 6 * 3600.0
+    ARTICLES_CHANNEL: str = "articles_pending"
+    TRANSLATION_POLL_INTERVAL: float = 300.0
     
     model_config = SettingsConfigDict(
         env_file=".env", 
@@ -36,53 +93,214 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     return Settings()
 
-def get_llm() -> BaseChatModel:
+_CLIENT_CACHES: List[Callable] = []
+
+def cached_client(func: Callable) -> Callable:
+    """
+    Caches a client/chain factory for the whole process so that HTTP connection
+    pools are reused across calls. Cleared by reset_clients().
+    """
+    cached = lru_cache()(func)
+    _CLIENT_CACHES.append(cached)
+    return cached
+
+def reset_clients() -> None:
+    """Drops cached settings, clients and chains (e.g. after changing the environment)."""
+    get_settings.cache_clear()
+    for cached in _CLIENT_CACHES:
+        cached.cache_clear()
+
+def _http_limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+@cached_client
+def get_http_client() -> httpx.Client:
+    return httpx.Client(limits=_http_limits(), timeout=get_settings().HTTP_TIMEOUT)
+
+@cached_client
+def get_async_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=_http_limits(), timeout=get_settings().HTTP_TIMEOUT)
+
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_event_loop_lock = threading.Lock()
+
+def run_async(coro: Awaitable[Any]) -> Any:
+    """
+    Runs a coroutine on a single long-lived background event loop and waits for it.
+    The cached async HTTP clients are bound to the loop they first ran on, so every
+    async call in the process must go through the same one.
+    """
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            _event_loop = asyncio.new_event_loop()
+            threading.Thread(target=_event_loop.run_forever, name="llm-event-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop).result()
+
+def _ollama_client_kwargs() -> dict:
+    return {"limits": _http_limits(), "timeout": get_settings().HTTP_TIMEOUT}
+
+def get_model_name(provider: Optional[LLMProvider] = None) -> str:
+    settings = get_settings()
+    provider = provider or settings.LLM_PROVIDER
+    return {
+        LLMProvider.OPENAI: settings.OPENAI_MODEL,
+        LLMProvider.ANTHROPIC: settings.ANTHROPIC_MODEL,
+        LLMProvider.OLLAMA: settings.OLLAMA_MODEL,
+        LLMProvider.FAKE: "fake",
+    }.get(provider, "unknown")
+
+def get_fast_model_name(provider: LLMProvider) -> Optional[str]:
+    """Cheaper/faster model of the provider used for short papers, if configured."""
+    settings = get_settings()
+    return {
+        LLMProvider.OPENAI: settings.OPENAI_FAST_MODEL,
+        LLMProvider.ANTHROPIC: settings.ANTHROPIC_FAST_MODEL,
+        LLMProvider.OLLAMA: settings.OLLAMA_FAST_MODEL,
+        LLMProvider.FAKE: settings.FAKE_FAST_MODEL,
+    }.get(provider)
+
+def is_provider_configured(provider: LLMProvider) -> bool:
     settings = get_settings()
+    if provider == LLMProvider.OPENAI:
+        return bool(settings.OPENAI_API_KEY)
+    if provider == LLMProvider.ANTHROPIC:
+        return bool(settings.ANTHROPIC_API_KEY)
+    return True
+
+@cached_client
+def get_llm(provider: Optional[LLMProvider] = None, model: Optional[str] = None) -> "BaseChatModel":
+    """Chat model for (provider, model); defaults to LLM_PROVIDER and its configured model."""
+    settings = get_settings()
+    provider = provider or settings.LLM_PROVIDER
+    model = model or get_model_name(provider)
     
-    if settings.LLM_PROVIDER == LLMProvider.OPENAI:
+    if provider == LLMProvider.OPENAI:
         if not settings.OPENAI_API_KEY:
             raise ValueError("A chave OPENAI_API_KEY é necessária para o provedor OpenAI")
+        from langchain_openai import ChatOpenAI
         return ChatOpenAI(
-            model=settings.OPENAI_MODEL, 
+            model=model, 
             api_key=settings.OPENAI_API_KEY,
-            temperature=0
+            temperature=0,
+            stream_usage=True,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
         )
         
-    elif settings.LLM_PROVIDER == LLMProvider.ANTHROPIC:
+    elif provider == LLMProvider.ANTHROPIC:
         if not settings.ANTHROPIC_API_KEY:
             raise ValueError("A chave ANTHROPIC_API_KEY é necessária para o provedor Anthropic")
+        from langchain_anthropic import ChatAnthropic
+        # ChatAnthropic keeps its own pooled client; caching the instance is what reuses it
         return ChatAnthropic(
-            model=settings.ANTHROPIC_MODEL, 
+            model=model, 
             api_key=settings.ANTHROPIC_API_KEY,
-            temperature=0
+            temperature=0,
+            default_request_timeout=settings.HTTP_TIMEOUT
         )
         
-    elif settings.LLM_PROVIDER == LLMProvider.OLLAMA:
+    elif provider == LLMProvider.OLLAMA:
+        from langchain_ollama import ChatOllama
         return ChatOllama(
             base_url=settings.OLLAMA_BASE_URL,
-            model=settings.OLLAMA_MODEL,
-            temperature=0
+            model=model,
+            temperature=0,
+            client_kwargs=_ollama_client_kwargs()
+        )
+        
+    elif provider == LLMProvider.FAKE:
+        from src.fake import FakeChatModel
+        return FakeChatModel(
+            latency_mean=settings.FAKE_LATENCY_MEAN,
+            latency_stddev=settings.FAKE_LATENCY_STDDEV,
+            latency_distribution=settings.FAKE_LATENCY_DISTRIBUTION,
+            tokens_per_second=settings.FAKE_TOKENS_PER_SECOND,
+            output_tokens=settings.FAKE_OUTPUT_TOKENS,
+            failure_rate=settings.FAKE_FAILURE_RATE,
+            seed=settings.FAKE_SEED,
+            model=model
         )
         
-    raise ValueError(f"Provedor LLM não suportado: {settings.LLM_PROVIDER}")
+    raise ValueError(f"Provedor LLM não suportado: {provider}")
 
-def get_embeddings() -> Embeddings:
+@cached_client
+def get_embeddings() -> "Embeddings":
     settings = get_settings()
     
     if settings.LLM_PROVIDER == LLMProvider.OPENAI:
          if not settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY is required for OpenAI embeddings")
-         return OpenAIEmbeddings(api_key=settings.OPENAI_API_KEY)
+         from langchain_openai import OpenAIEmbeddings
+         return OpenAIEmbeddings(
+             model=settings.OPENAI_EMBEDDING_MODEL,
+             api_key=settings.OPENAI_API_KEY,
+             chunk_size=settings.EMBEDDING_BATCH_SIZE,
+             http_client=get_http_client(),
+             http_async_client=get_async_http_client()
+         )
          
     elif settings.LLM_PROVIDER == LLMProvider.ANTHROPIC:
         if settings.OPENAI_API_KEY:
-             return OpenAIEmbeddings(api_key=settings.OPENAI_API_KEY)
+             from langchain_openai import OpenAIEmbeddings
+             return OpenAIEmbeddings(
+                 model=settings.OPENAI_EMBEDDING_MODEL,
+                 api_key=settings.OPENAI_API_KEY,
+                 chunk_size=settings.EMBEDDING_BATCH_SIZE,
+                 http_client=get_http_client(),
+                 http_async_client=get_async_http_client()
+             )
         raise ValueError("Provedor Anthropic selecionado, mas nenhuma chave OpenAI para embeddings. Por favor, configure um provedor de embeddings separado ou adicione a chave OpenAI.")
 
     elif settings.LLM_PROVIDER == LLMProvider.OLLAMA:
+        from langchain_ollama import OllamaEmbeddings
         return OllamaEmbeddings(
             base_url=settings.OLLAMA_BASE_URL,
-            model="nomic-embed-text" # A good default for embeddings in Ollama
+            model=settings.OLLAMA_EMBEDDING_MODEL,
+            client_kwargs=_ollama_client_kwargs()
         )
     
-    raise ValueError(f"Provedor LLM não suportado para Embeddings: {settings.LLM_PROVIDER}")
\ No newline at end of file
+    elif settings.LLM_PROVIDER == LLMProvider.FAKE:
+        from src.fake import FakeEmbeddings
+        return FakeEmbeddings(
+            size=settings.FAKE_EMBEDDING_SIZE,
+            latency_mean=settings.FAKE_LATENCY_MEAN,
+            latency_stddev=settings.FAKE_LATENCY_STDDEV,
+            latency_distribution=settings.FAKE_LATENCY_DISTRIBUTION,
+            failure_rate=settings.FAKE_FAILURE_RATE,
+            seed=settings.FAKE_SEED
+        )
+    
+    raise ValueError(f"Provedor LLM não suportado para Embeddings: {settings.LLM_PROVIDER}")
+
+def get_embedding_model_name() -> str:
+    """Identifies the embedding model in use; cached vectors are namespaced by it."""
+    settings = get_settings()
+    if settings.LLM_PROVIDER == LLMProvider.OLLAMA:
+        return f"ollama-{settings.OLLAMA_EMBEDDING_MODEL}"
+    if settings.LLM_PROVIDER == LLMProvider.FAKE:
+        return f"fake-{settings.FAKE_EMBEDDING_SIZE}"
+    return f"openai-{settings.OPENAI_EMBEDDING_MODEL}"
+
+@cached_client
+def get_cached_embeddings() -> "Embeddings":
+    """
+    Wraps get_embeddings() with a local on-disk cache keyed by chunk content hash
+    and embedding model, so already-seen chunks never hit the provider again.
+    Cache misses are sent in batches of EMBEDDING_BATCH_SIZE.
+    """
+    from langchain.embeddings import CacheBackedEmbeddings
+    from langchain.storage import LocalFileStore
+
+    settings = get_settings()
+    return CacheBackedEmbeddings.from_bytes_store(
+        get_embeddings(),
+        LocalFileStore(settings.EMBEDDING_CACHE_DIR),
+        namespace=get_embedding_model_name(),
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+    )
@@ -0,0 +1,101 @@
+import logging
+from typing import Callable, Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+from src.config import get_cached_embeddings, get_settings
+from src.ingest import split_documents
+
+logger = logging.getLogger(__name__)
+
+# One retrieval query per section of FINAL_PROMPT_TEMPLATE
+SECTION_QUERIES: Dict[str, str] = {
+    "overview": "Title, abstract and main contribution of the paper",
+    "problem": "Context and motivation: what problem the researchers are trying to solve and why it is important",
+    "method": "Methodology and approach: methods, models, datasets and experimental setup used",
+    "results": "Key results and findings: measurements, numbers, comparisons and discoveries",
+    "implications": "Conclusion and implications: what the results mean, limitations and impact on the field",
+}
+
+Retriever = Callable[[str], List[Document]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token), good enough for budgeting."""
+    return max(1, len(text) // 4)
+
+
+def _chunk_key(doc: Document) -> tuple:
+    metadata = doc.metadata or {}
+    return (
+        metadata.get("source"),
+        metadata.get("page"),
+        metadata.get("start_index"),
+        doc.page_content if "start_index" not in metadata else None,
+    )
+
+
+def _chunk_position(doc: Document) -> tuple:
+    metadata = doc.metadata or {}
+    return (str(metadata.get("source", "")), metadata.get("page", 0), metadata.get("start_index", 0))
+
+
+def select_context(
+    retrieve: Retriever,
+    token_budget: int,
+    extra_queries: Optional[Sequence[str]] = None,
+) -> str:
+    """
+    Retrieves the top chunks for each summary section and interleaves them
+    (best chunk of every section first) until the token budget is spent.
+    Selected chunks are returned in document order.
+    """
+    queries = list(SECTION_QUERIES.values()) + list(extra_queries or [])
+    ranked = [retrieve(query) for query in queries]
+
+    selected: Dict[tuple, Document] = {}
+    used = 0
+    for rank in range(max((len(docs) for docs in ranked), default=0)):
+        for docs in ranked:
+            if rank >= len(docs):
+                continue
+            doc = docs[rank]
+            key = _chunk_key(doc)
+            if key in selected:
+                continue
+            cost = estimate_tokens(doc.page_content)
+            if used + cost > token_budget:
+                continue
+            selected[key] = doc
+            used += cost
+
+    ordered = sorted(selected.values(), key=_chunk_position)
+    return "\n\n".join(doc.page_content for doc in ordered)
+
+
+def build_article_context(text: str, token_budget: Optional[int] = None) -> str:
+    """
+    Builds the LLM context for a single article. Short texts are sent as-is;
+    longer ones are chunked, indexed in memory and reduced to the chunks most
+    relevant to each summary section.
+    """
+    settings = get_settings()
+    budget = token_budget or settings.CONTEXT_TOKEN_BUDGET
+
+    if estimate_tokens(text) <= budget:
+        return text
+
+    try:
+        embeddings = get_cached_embeddings()
+    except ValueError as e:
+        logger.warning(f"No embeddings available, sending full text: {e}")
+        return text
+
+    from langchain_core.vectorstores import InMemoryVectorStore
+
+    chunks = split_documents([Document(page_content=text)])
+    store = InMemoryVectorStore(embedding=embeddings)
+    store.add_documents(chunks)
+
+    k = settings.CONTEXT_CHUNKS_PER_SECTION
+    return select_context(lambda query: store.similarity_search(query, k=k), budget)
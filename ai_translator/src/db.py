@@ -8,7 +8,10 @@ from sqlalchemy import (
     ARRAY,
     TIMESTAMP,
     Float,
-    Integer
+    Integer,
+    ForeignKey,
+    UniqueConstraint,
+    text
 )
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.sql import func
@@ -31,6 +34,9 @@ class Article(Base):
     processing_status = Column(String(50), default='downloaded')
     simplified_text = Column(Text, nullable=True)
     relevance_score = Column(Float, nullable=True)
+    translation_attempts = Column(Integer, nullable=False, default=0, server_default='0')
+    next_attempt_at = Column(TIMESTAMP(timezone=True), nullable=True, index=True)
+    last_error = Column(Text, nullable=True)
 
     created_at = Column(
         TIMESTAMP(timezone=True), 
@@ -40,6 +46,45 @@ class Article(Base):
     def __repr__(self):
         return f"<Article(id='{self.id}', title='{self.title[:30]}...', score={self.relevance_score})>"
 
+class TranslationMetric(Base):
+    """One translation attempt: tokens, timings and estimated cost (see src.telemetry)."""
+    __tablename__ = 'translation_metrics'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(String, index=True, nullable=False)
+    provider = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False)
+    input_tokens = Column(Integer, default=0)
+    output_tokens = Column(Integer, default=0)
+    cached_input_tokens = Column(Integer, default=0)
+    time_to_first_token = Column(Float, nullable=True)
+    latency = Column(Float, nullable=False)
+    retries = Column(Integer, default=0)
+    estimated_cost = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        index=True
+    )
+
+class ArticleVariant(Base):
+    """Simplified text written for one audience (users.profile_type)."""
+    __tablename__ = 'article_variants'
+    __table_args__ = (UniqueConstraint('article_id', 'profile_type', name='uq_article_variant_profile'),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(String, ForeignKey('articles.id', ondelete='CASCADE'), nullable=False, index=True)
+    profile_type = Column(String(20), nullable=False)
+    simplified_text = Column(Text, nullable=False)
+
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now()
+    )
+
 def get_db_engine():
     settings = get_settings()
     if not settings.DATABASE_URL:
@@ -55,7 +100,21 @@ def get_session():
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return SessionLocal()
 
+# Columns added after the tables were first deployed; create_all does not alter existing tables
+SCHEMA_MIGRATIONS = [
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS translation_attempts INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE",
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS last_error TEXT",
+    "CREATE INDEX IF NOT EXISTS ix_articles_next_attempt_at ON articles (next_attempt_at)",
+    # Same index under the name web/init.sql used to give it
+    "DROP INDEX IF EXISTS idx_articles_next_attempt",
+    "ALTER TABLE translation_metrics ADD COLUMN IF NOT EXISTS cached_input_tokens INTEGER DEFAULT 0",
+]
+
 def init_db():
     """Creates the database tables if they don't exist."""
     engine = get_db_engine()
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for statement in SCHEMA_MIGRATIONS:
+            conn.execute(text(statement))
@@ -1,75 +1,384 @@
+import asyncio
 import logging
+import random
 import time
-from sqlalchemy import select, and_
-from src.db import get_session, Article, init_db
-from src.rag import translate_text
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import select, update, and_, or_, exists, func
+from sqlalchemy.dialects.postgresql import insert
+from src.config import get_model_name, get_settings, run_async
+from src.db import get_session, Article, ArticleVariant, init_db
+from src.notifications import ArticleListener, notify_articles_pending
+from src.priority import estimated_tokens_expression, priority_expression, within_budget
+from src.rag import AUDIENCE_INSTRUCTIONS, ArticlePrompt, astream_translation, translate_text, translate_variants
+from src.router import get_router
+from src.telemetry import TranslationRun, record_translation
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def process_articles(loop: bool = False, sleep_interval: int = 60):
+# Articles in these states may hold a checkpointed partial simplified_text to resume from
+RESUMABLE_STATUSES = ('translating', 'failed_translation')
+# Articles that exhausted TRANSLATION_MAX_ATTEMPTS; only `requeue` puts them back in the queue
+DEAD_LETTER_STATUS = 'dead_letter'
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff (with up to 25% jitter) before the next attempt, in seconds."""
+    settings = get_settings()
+    delay = min(settings.RETRY_BACKOFF_MAX, settings.RETRY_BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(1.0, 1.25)
+
+def schedule_retry(article: Article, error: Exception) -> None:
+    """Counts the failed attempt and either schedules the next one or dead-letters the article."""
+    settings = get_settings()
+    article.translation_attempts = (article.translation_attempts or 0) + 1
+    article.last_error = str(error)[:2000]
+    if article.translation_attempts >= settings.TRANSLATION_MAX_ATTEMPTS:
+        article.processing_status = DEAD_LETTER_STATUS
+        article.next_attempt_at = None
+        logger.warning(f"Article {article.id} moved to {DEAD_LETTER_STATUS} after {article.translation_attempts} attempts")
+    else:
+        article.processing_status = 'failed_translation'
+        delay = retry_delay(article.translation_attempts)
+        article.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        logger.info(f"Article {article.id} will be retried in {delay:.0f}s (attempt {article.translation_attempts})")
+
+def translation_audiences() -> List[str]:
+    audiences = [a.strip().lower() for a in get_settings().TRANSLATION_AUDIENCES.split(",") if a.strip()]
+    unknown = set(audiences) - AUDIENCE_INSTRUCTIONS.keys()
+    if unknown:
+        raise ValueError(f"Unknown TRANSLATION_AUDIENCES: {', '.join(sorted(unknown))}")
+    return audiences
+
+def save_variants(session, article_id: str, variants: Dict[str, str]) -> None:
+    for profile_type, simplified_text in variants.items():
+        stmt = insert(ArticleVariant).values(
+            article_id=article_id, profile_type=profile_type, simplified_text=simplified_text
+        )
+        session.execute(stmt.on_conflict_do_update(
+            constraint='uq_article_variant_profile',
+            set_={"simplified_text": stmt.excluded.simplified_text, "created_at": func.now()}
+        ))
+    session.commit()
+
+def generate_variants(
+    session,
+    article: Article,
+    audiences: Sequence[str],
+    run: TranslationRun = None,
+    prompt: Optional[ArticlePrompt] = None,
+) -> bool:
+    """
+    Writes the per-audience versions; a failure here leaves the generic
+    translation in place. Pass the prompt of the generic translation to reuse
+    its context and warm route.
+    """
+    try:
+        prompt = prompt or ArticlePrompt(article.full_text)
+        save_variants(session, article.id, translate_variants(prompt, audiences, run))
+        return True
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"Could not generate audience variants for article {article.id}: {e}")
+        return False
+
+def translate_with_checkpoints(session, article: Article, prompt: ArticlePrompt, run: TranslationRun = None) -> str:
+    """
+    Streams the translation and periodically flushes the partial markdown to
+    simplified_text under the 'translating' status, so a crash only loses the
+    tokens generated since the last flush. A checkpoint left by a previous
+    attempt is resumed instead of regenerated.
+    """
+    settings = get_settings()
+    partial = article.simplified_text if article.processing_status in RESUMABLE_STATUSES else None
+    if partial:
+        logger.info(f"Resuming article {article.id} from {len(partial)} checkpointed characters")
+
+    article.processing_status = 'translating'
+    session.commit()
+
+    buffer = [partial] if partial else []
+
+    def flush():
+        article.simplified_text = "".join(buffer)
+        session.commit()
+
+    async def consume():
+        last_flush = time.monotonic()
+        async for token in astream_translation(prompt, resume_from=partial or "", run=run):
+            buffer.append(token)
+            if time.monotonic() - last_flush >= settings.STREAM_FLUSH_INTERVAL:
+                await asyncio.to_thread(flush)
+                last_flush = time.monotonic()
+
+    run_async(consume())
+    return "".join(buffer)
+
+def record_run(session, run: TranslationRun, status: str, error: Optional[str] = None):
+    """record_translation that only logs on failure, so telemetry never affects the article."""
+    try:
+        return record_translation(session, run, status, error=error)
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"Could not record translation metrics for article {run.article_id}: {e}")
+        return None
+
+def process_article(article_id: str) -> bool:
+    """Translates one article in its own session. Returns True on success."""
+    session = get_session()
+    try:
+        article = session.get(Article, article_id)
+        if article is None:
+            return False
+
+        logger.info(f"Processing article ID: {article.id} - Title: {article.title[:50]}...")
+        
+        settings = get_settings()
+        # Validated before translating: a bad TRANSLATION_AUDIENCES must not fail a finished translation
+        audiences = translation_audiences()
+        run = TranslationRun(
+            article_id=article.id,
+            provider=settings.LLM_PROVIDER.value,
+            model=get_model_name(),
+        )
+        try:
+            start_time = time.time()
+            # Shared with the variants: same context string, same route
+            prompt = ArticlePrompt(article.full_text)
+            
+            if settings.TRANSLATION_STREAMING:
+                translated_content = translate_with_checkpoints(session, article, prompt, run)
+            else:
+                translated_content = translate_text(prompt, run)
+            
+            article.simplified_text = translated_content
+            article.processing_status = 'translated'
+            article.next_attempt_at = None
+            article.last_error = None
+            
+            session.commit()
+            
+        except Exception as e:
+            logger.error(f"Error processing article {article_id}: {e}")
+            # Rolls back to the last checkpoint, which the next attempt resumes from
+            session.rollback()
+            schedule_retry(article, e)
+            session.commit()
+            record_run(session, run, "failed", error=str(e))
+            return False
+
+        # The article is committed by now: telemetry can fail without touching its status
+        elapsed = time.time() - start_time
+        metric = record_run(session, run, "success")
+        tokens = f" ({metric.input_tokens} in / {metric.output_tokens} out tokens)" if metric else ""
+        logger.info(f"Successfully processed article {article_id} in {elapsed:.2f}s{tokens}")
+
+        if audiences:
+            # Recorded as a run of its own, so variant calls never add to the translation's latency or tokens
+            variants_run = TranslationRun(article_id=article.id, provider=run.provider, model=run.model)
+            ok = generate_variants(session, article, audiences, variants_run, prompt)
+            record_run(session, variants_run, "variants" if ok else "failed_variants")
+        return True
+    finally:
+        session.close()
+
+def pending_condition():
+    """Needs processing (or was interrupted mid-translation) and its backoff has expired."""
+    return and_(
+        or_(
+            Article.simplified_text.is_(None),
+            Article.processing_status.in_(RESUMABLE_STATUSES)
+        ),
+        Article.full_text.is_not(None),
+        Article.processing_status.is_distinct_from(DEAD_LETTER_STATUS),
+        or_(
+            Article.next_attempt_at.is_(None),
+            Article.next_attempt_at <= func.now()
+        )
+    )
+
+def has_pending_articles(session) -> bool:
+    return session.execute(select(exists().where(pending_condition()))).scalar()
+
+def pending_article_ids(
+    session,
+    only_ids: Optional[Sequence[str]] = None,
+    token_budget: Optional[int] = None,
+) -> List[str]:
+    """
+    Articles that need processing (or were interrupted mid-translation) and whose
+    backoff has expired, highest priority first (see src.priority), cut to the
+    ones that fit token_budget.
+    """
+    stmt = select(Article.id, estimated_tokens_expression()).where(pending_condition())
+    if only_ids is not None:
+        stmt = stmt.where(Article.id.in_(only_ids))
+    stmt = stmt.order_by(priority_expression().desc(), Article.created_at, Article.id)
+    return within_budget(session.execute(stmt).all(), token_budget)
+
+def process_pending(
+    concurrency: Optional[int] = None,
+    only_ids: Optional[Sequence[str]] = None,
+    token_budget: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    One pass over the pending articles in priority order, translating up to
+    `concurrency` at a time and stopping at the estimated `token_budget`
+    (TRANSLATION_TOKEN_BUDGET). Returns (succeeded, failed).
+    """
+    settings = get_settings()
+    concurrency = concurrency or settings.TRANSLATION_CONCURRENCY
+    token_budget = token_budget or settings.TRANSLATION_TOKEN_BUDGET
+
+    session = get_session()
+    try:
+        article_ids = pending_article_ids(session, only_ids, token_budget)
+    finally:
+        session.close()
+
+    if not article_ids:
+        return 0, 0
+
+    logger.info(f"Found {len(article_ids)} articles to process (concurrency={concurrency}).")
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="translator") as executor:
+            results = list(executor.map(process_article, article_ids))
+    else:
+        results = [process_article(article_id) for article_id in article_ids]
+
+    succeeded = sum(results)
+    if get_settings().LLM_ROUTING:
+        for row in get_router().snapshot():
+            logger.info(
+                f"Route {row['route']}: {row['requests']} requests, p50 {row['p50'] or 0:.1f}s, "
+                f"p95 {row['p95'] or 0:.1f}s, {row['error_rate']:.0%} errors"
+                + (" (cooling down)" if row["cooling_down"] else "")
+            )
+    return succeeded, len(results) - succeeded
+
+def process_variants(only_ids: Optional[Sequence[str]] = None) -> int:
+    """Backfills the configured audience variants of translated articles that miss any. Returns how many articles."""
+    audiences = translation_audiences()
+    if not audiences:
+        return 0
+
+    session = get_session()
+    try:
+        have_all = (
+            select(func.count(ArticleVariant.id))
+            .where(ArticleVariant.article_id == Article.id, ArticleVariant.profile_type.in_(audiences))
+            .scalar_subquery()
+        )
+        stmt = select(Article).where(
+            Article.processing_status == 'translated',
+            Article.full_text.is_not(None),
+            have_all < len(audiences)
+        )
+        if only_ids is not None:
+            stmt = stmt.where(Article.id.in_(only_ids))
+        articles = session.execute(stmt).scalars().all()
+        for article in articles:
+            logger.info(f"Generating {', '.join(audiences)} variants for article {article.id}")
+            run = TranslationRun(article_id=article.id, provider=get_settings().LLM_PROVIDER.value, model=get_model_name())
+            ok = generate_variants(session, article, audiences, run)
+            record_run(session, run, "variants" if ok else "failed_variants")
+        return len(articles)
+    finally:
+        session.close()
+
+def dead_letters(session) -> List[Article]:
+    stmt = select(Article).where(Article.processing_status == DEAD_LETTER_STATUS).order_by(Article.id)
+    return list(session.execute(stmt).scalars().all())
+
+def requeue_dead_letters(article_ids: Optional[Sequence[str]] = None) -> int:
+    """Gives dead-lettered articles (all, or only article_ids) a fresh set of attempts. Returns how many."""
+    session = get_session()
+    try:
+        stmt = (
+            update(Article)
+            .where(Article.processing_status == DEAD_LETTER_STATUS)
+            .values(processing_status='failed_translation', translation_attempts=0, next_attempt_at=None)
+        )
+        if article_ids:
+            stmt = stmt.where(Article.id.in_(article_ids))
+        requeued = session.execute(stmt.returning(Article.id)).scalars().all()
+        for article_id in requeued:
+            notify_articles_pending(session, article_id)
+        session.commit()
+        return len(requeued)
+    finally:
+        session.close()
+
+def seconds_until_next_retry(session) -> Optional[float]:
+    """Time until the earliest backed-off article becomes eligible again, if any is still waiting."""
+    next_at = session.execute(
+        select(func.min(Article.next_attempt_at)).where(
+            Article.processing_status == 'failed_translation',
+            Article.next_attempt_at > func.now()
+        )
+    ).scalar()
+    if next_at is None:
+        return None
+    return max(0.0, (next_at - datetime.now(timezone.utc)).total_seconds())
+
+def process_articles(
+    loop: bool = False,
+    sleep_interval: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    token_budget: Optional[int] = None,
+):
     """
     Fetches articles from DB with null simplified_text and full_text available,
-    translates them, and saves back to DB.
+    translates them, and saves back to DB. In loop mode the worker blocks on
+    LISTEN until the scraper announces a new article; polling every
+    sleep_interval (TRANSLATION_POLL_INTERVAL) is only a safety net.
     """
     logger.info("Starting article processing service...")
     
     # Ensure tables exist
     init_db()
     logger.info("Database initialized.")
-    
-    while True:
-        session = get_session()
-        try:
-            # Query for articles that need processing
-            stmt = select(Article).where(
-                and_(
-                    Article.simplified_text.is_(None),
-                    Article.full_text.is_not(None)
-                )
-            )
-            
-            result = session.execute(stmt)
-            articles = result.scalars().all()
-            
-            if articles:
-                logger.info(f"Found {len(articles)} articles to process.")
-                
-                for article in articles:
-                    logger.info(f"Processing article ID: {article.id} - Title: {article.title[:50]}...")
-                    
-                    try:
-                        start_time = time.time()
-                        
-                        translated_content = translate_text(article.full_text)
-                        
-                        article.simplified_text = translated_content
-                        article.processing_status = 'translated'
-                        
-                        session.commit()
-                        
-                        elapsed = time.time() - start_time
-                        logger.info(f"Successfully processed article {article.id} in {elapsed:.2f}s")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing article {article.id}: {e}")
-                        session.rollback()
-                        article.processing_status = 'failed_translation'
-                        session.commit()
-            else:
-                if loop:
-                    logger.debug(f"No pending articles. Sleeping for {sleep_interval}s...")
-            
-        except Exception as e:
-            logger.error(f"Database error: {e}")
-        finally:
-            session.close()
+    # Fail fast on a misconfigured TRANSLATION_AUDIENCES instead of on the first article
+    translation_audiences()
 
-        if not loop:
-            break
-            
-        time.sleep(sleep_interval)
+    poll_interval = sleep_interval or get_settings().TRANSLATION_POLL_INTERVAL
+    budgeted = (token_budget or get_settings().TRANSLATION_TOKEN_BUDGET) is not None
+    listener = ArticleListener() if loop else None
+    try:
+        while True:
+            timeout = poll_interval
+            try:
+                processed = process_pending(concurrency, token_budget=token_budget)
+                if processed == (0, 0) and loop:
+                    logger.debug("No pending articles. Waiting for notifications...")
+
+                session = get_session()
+                try:
+                    if budgeted and has_pending_articles(session):
+                        # The token budget left eligible articles for a later pass:
+                        # keep the full poll interval so the budget actually throttles
+                        next_retry = None
+                    else:
+                        # Wake up in time for the next backed-off retry
+                        next_retry = seconds_until_next_retry(session)
+                finally:
+                    session.close()
+                if next_retry is not None:
+                    timeout = min(timeout, next_retry)
+            except Exception as e:
+                logger.error(f"Database error: {e}")
+
+            if not loop:
+                break
+
+            woken_by = listener.wait(timeout)
+            if woken_by:
+                logger.info(f"Woken up by {len(woken_by)} new article(s)")
+    finally:
+        if listener is not None:
+            listener.close()
 
 if __name__ == "__main__":
     process_articles()
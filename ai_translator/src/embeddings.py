@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from src.config import cached_client, get_cached_embeddings, get_settings
+
+class QueryCacheEmbeddings(Embeddings):
+    """
+    In-memory LRU cache of query embeddings in front of the (disk-cached)
+    document embedder. Retrieval repeats the same section queries for every
+    request, so in a long-lived process most searches skip the provider.
+    """
+
+    def __init__(self, underlying: Embeddings, maxsize: int = 1024):
+        self.underlying = underlying
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.underlying.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.underlying.aembed_documents(texts)
+
+    def _lookup(self, text: str):
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return vector
+
+    def _store(self, text: str, vector: List[float]) -> None:
+        with self._lock:
+            self._cache[text] = vector
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self._lookup(text)
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            self._store(text, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        vector = self._lookup(text)
+        if vector is None:
+            vector = await self.underlying.aembed_query(text)
+            self._store(text, vector)
+        return vector
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._cache), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+@cached_client
+def get_query_cached_embeddings() -> QueryCacheEmbeddings:
+    return QueryCacheEmbeddings(get_cached_embeddings(), get_settings().QUERY_EMBEDDING_CACHE_SIZE)
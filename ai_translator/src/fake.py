@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import random
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+class FakeProviderError(RuntimeError):
+    """Injected failure, raised with probability failure_rate. Looks like a 503 to the router."""
+    status_code = 503
+
+def sample_latency(rng: random.Random, distribution: str, mean: float, stddev: float) -> float:
+    """One draw of the configured latency distribution (normal | exponential | fixed), in seconds."""
+    if distribution == "fixed":
+        return mean
+    if distribution == "exponential":
+        return rng.expovariate(1 / mean) if mean > 0 else 0.0
+    return max(0.0, rng.gauss(mean, stddev))
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline chat model for load tests. Output is deterministic for a given prompt
+    (markdown shaped like FINAL_PROMPT_TEMPLATE); latency, generation speed and
+    failures follow the configured distributions.
+    """
+    latency_mean: float = 0.5
+    latency_stddev: float = 0.1
+    latency_distribution: str = "normal"  # normal | exponential | fixed
+    tokens_per_second: float = 80.0
+    output_tokens: int = 600
+    failure_rate: float = 0.0
+    seed: Optional[int] = None
+    model: str = "fake"
+
+    _rng: random.Random
+    _cached_prefixes: set
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+        self._cached_prefixes = set()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _first_token_delay(self) -> float:
+        return sample_latency(self._rng, self.latency_distribution, self.latency_mean, self.latency_stddev)
+
+    def _should_fail(self) -> bool:
+        return self.failure_rate > 0 and self._rng.random() < self.failure_rate
+
+    def _token_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _tokens(self, messages: List[BaseMessage]) -> List[str]:
+        digest = hashlib.sha256("".join(str(m.content) for m in messages).encode()).hexdigest()
+        sections = [
+            f"# Overview {digest[:8]}\n\n",
+            "## 1. Introduction & Problem Statement\n\n",
+            "## 2. Methodology & Approach\n\n",
+            "## 3. Key Results & Findings\n\n",
+            "## 4. Conclusion & Implications\n\n",
+        ]
+        per_section = max(1, self.output_tokens // len(sections))
+        tokens = []
+        for index, heading in enumerate(sections):
+            tokens.append(heading)
+            tokens.extend(f"{digest[(index + i) % len(digest)]}word{i} " for i in range(per_section - 1))
+            tokens.append("\n\n")
+        return tokens
+
+    def _usage(self, messages: List[BaseMessage], output_tokens: int) -> dict:
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        # Mimics provider prompt caching: a repeated leading system message is a cache hit
+        cache_read = 0
+        if len(messages) > 1 and messages[0].type == "system":
+            prefix = hashlib.sha256(str(messages[0].content).encode()).hexdigest()
+            if prefix in self._cached_prefixes:
+                cache_read = len(str(messages[0].content)) // 4
+            self._cached_prefixes.add(prefix)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_token_details": {"cache_read": cache_read},
+        }
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tokens = self._tokens(messages)
+        time.sleep(self._first_token_delay() + len(tokens) * self._token_delay())
+        if self._should_fail():
+            raise FakeProviderError("Injected fake provider failure")
+        message = AIMessage(content="".join(tokens), usage_metadata=self._usage(messages, len(tokens)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        tokens = self._tokens(messages)
+        fail_at = self._rng.randrange(len(tokens)) if self._should_fail() else None
+        time.sleep(self._first_token_delay())
+        for index, token in enumerate(tokens):
+            if index == fail_at:
+                raise FakeProviderError("Injected fake provider failure")
+            time.sleep(self._token_delay())
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(content="", usage_metadata=self._usage(messages, len(tokens)))
+        )
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        tokens = self._tokens(messages)
+        fail_at = self._rng.randrange(len(tokens)) if self._should_fail() else None
+        await asyncio.sleep(self._first_token_delay())
+        for index, token in enumerate(tokens):
+            if index == fail_at:
+                raise FakeProviderError("Injected fake provider failure")
+            await asyncio.sleep(self._token_delay())
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(content="", usage_metadata=self._usage(messages, len(tokens)))
+        )
+
+class FakeEmbeddings(DeterministicFakeEmbedding):
+    """
+    Offline embeddings for load tests. Vectors are deterministic per text; each
+    call (one provider request) waits the configured latency and fails with
+    probability failure_rate, like FakeChatModel.
+    """
+    latency_mean: float = 0.5
+    latency_stddev: float = 0.1
+    latency_distribution: str = "normal"  # normal | exponential | fixed
+    failure_rate: float = 0.0
+    seed: Optional[int] = None
+
+    _rng: random.Random
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    def _request(self) -> None:
+        time.sleep(sample_latency(self._rng, self.latency_distribution, self.latency_mean, self.latency_stddev))
+        if self.failure_rate > 0 and self._rng.random() < self.failure_rate:
+            raise FakeProviderError("Injected fake embeddings failure")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self._request()
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        self._request()
+        return super().embed_query(text)
@@ -1,21 +1,75 @@
+import glob
+import hashlib
 import os
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_chroma import Chroma
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_core.documents import Document
+from src.config import get_settings
+from src.vectorstore import (
+    article_id_from_path,
+    delete_article,
+    get_vectorstore,
+    indexed_article_ids,
+    indexed_articles,
+    prepare_article_chunks,
+    upsert_article,
+)
 
-from src.config import get_embeddings, get_settings
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+    from langchain_core.documents import Document
 
-def load_pdf(file_path: str) -> List[Document]:
+def _extract_pages(job: Tuple[str, int, int]) -> List[Tuple[str, str]]:
+    """(label, text) of pages [start, stop) of a PDF; also the process pool worker for large files."""
+    import pymupdf
+
+    file_path, start, stop = job
+    with pymupdf.open(file_path) as doc:
+        return [
+            (doc[index].get_label() or str(index + 1), doc[index].get_text())
+            for index in range(start, stop)
+        ]
+
+def load_pdf(file_path: str, parallel: bool = True) -> List["Document"]:
+    """
+    One Document per page, parsed with PyMuPDF (same extractor as the scraper),
+    with PyPDFLoader's source/page metadata. PDFs with at least
+    PDF_PARALLEL_MIN_PAGES pages are split into page ranges parsed in a process
+    pool, unless parallel is False (e.g. when already inside a pool worker).
+    """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
-    
-    loader = PyPDFLoader(file_path)
-    return loader.load()
 
-def split_documents(documents: List[Document]) -> List[Document]:
+    import pymupdf
+    from langchain_core.documents import Document
+
+    settings = get_settings()
+    with pymupdf.open(file_path) as doc:
+        total_pages = doc.page_count
+
+    workers = min(settings.PDF_PARSE_WORKERS or os.cpu_count() or 1, total_pages)
+    if parallel and workers > 1 and total_pages >= settings.PDF_PARALLEL_MIN_PAGES:
+        step = -(-total_pages // workers)
+        jobs = [(file_path, start, min(start + step, total_pages)) for start in range(0, total_pages, step)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pages = [page for pages in executor.map(_extract_pages, jobs) for page in pages]
+    else:
+        pages = _extract_pages((file_path, 0, total_pages))
+
+    return [
+        Document(
+            page_content=text,
+            metadata={"source": file_path, "page": index, "page_label": label, "total_pages": total_pages},
+        )
+        for index, (label, text) in enumerate(pages)
+    ]
+
+def text_content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def split_documents(documents: List["Document"]) -> List["Document"]:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=1000,
         chunk_overlap=200,
@@ -23,26 +77,183 @@ def split_documents(documents: List[Document]) -> List[Document]:
     )
     return text_splitter.split_documents(documents)
 
-def index_documents(documents: List[Document]) -> Chroma:
-    settings = get_settings()
-    embeddings = get_embeddings()
+def file_content_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-    vector_store = Chroma.from_documents(
-        documents=documents,
-        embedding=embeddings,
-        persist_directory=settings.CHROMA_PERSIST_DIRECTORY
-    )
+def index_documents(documents: List["Document"], article_id: str) -> "Chroma":
+    vector_store = get_vectorstore()
+    upsert_article(vector_store, article_id, documents)
     return vector_store
 
-def ingest_paper(file_path: str) -> str:
+def ingest_paper(file_path: str, article_id: Optional[str] = None) -> str:
+    article_id = article_id or article_id_from_path(file_path)
     print(f"Carregando {file_path}...")
     docs = load_pdf(file_path)
     print(f"Carregado {len(docs)} páginas.")
-    
+
     chunks = split_documents(docs)
+    content_hash = file_content_hash(file_path)
+    for chunk in chunks:
+        chunk.metadata["content_hash"] = content_hash
     print(f"Dividido em {len(chunks)} chunks.")
-    
+
     print("Indexando no ChromaDB...")
-    index_documents(chunks)
-    
+    index_documents(chunks, article_id)
+
     return f"Inserido com sucesso {file_path} com {len(chunks)} chunks."
+
+def collect_pdf_paths(directory: Optional[str] = None, pattern: Optional[str] = None) -> List[Tuple[str, str]]:
+    """(article_id, path) pairs for the matching PDFs; the article ID is the file stem."""
+    if directory:
+        pattern = os.path.join(directory, "**", "*.pdf")
+    if not pattern:
+        return []
+    paths = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return [(article_id_from_path(path), path) for path in paths]
+
+def full_texts_from_db() -> Dict[str, str]:
+    """article_id -> full_text already extracted by the scraper, so those PDFs need no parsing."""
+    from sqlalchemy import select
+    from src.db import Article, get_session
+
+    session = get_session()
+    try:
+        return dict(session.execute(
+            select(Article.id, Article.full_text).where(Article.full_text.is_not(None))
+        ).all())
+    finally:
+        session.close()
+
+def article_ids_from_db() -> List[str]:
+    from sqlalchemy import select
+    from src.db import Article, get_session
+
+    session = get_session()
+    try:
+        return list(session.execute(select(Article.id)).scalars().all())
+    finally:
+        session.close()
+
+def pdf_paths_from_db(pdf_root: Optional[str] = None) -> List[Tuple[str, str]]:
+    """(article_id, path) of every article with an original_pdf_path, resolved against pdf_root if relative."""
+    from sqlalchemy import select
+    from src.db import Article, get_session
+
+    session = get_session()
+    try:
+        stored = session.execute(
+            select(Article.id, Article.original_pdf_path).where(Article.original_pdf_path.is_not(None))
+        ).all()
+    finally:
+        session.close()
+
+    if pdf_root:
+        return [
+            (article_id, path if os.path.isabs(path) else os.path.join(pdf_root, path))
+            for article_id, path in stored
+        ]
+    return [(article_id, path) for article_id, path in stored]
+
+def _load_and_split(job: Tuple[str, str, str, Optional[str]]) -> Tuple[str, str, List["Document"], Optional[str]]:
+    """
+    Process pool worker: chunks one article, from its stored text when given,
+    otherwise by parsing the PDF. Returns (article_id, path, chunks, error).
+    """
+    article_id, file_path, content_hash, text = job
+    try:
+        if text is not None:
+            from langchain_core.documents import Document
+            documents = [Document(page_content=text, metadata={"source": file_path, "page": 0})]
+        else:
+            # The pool already parallelises across files
+            documents = load_pdf(file_path, parallel=False)
+        chunks = split_documents(documents)
+    except Exception as e:
+        return article_id, file_path, [], str(e)
+    for chunk in chunks:
+        chunk.metadata["content_hash"] = content_hash
+    return article_id, file_path, chunks, None
+
+def ingest_corpus(
+    articles: Iterable[Tuple[str, str]],
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    texts: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Bulk ingestion of (article_id, path) pairs: articles already indexed from the
+    same content hash are skipped, the rest are parsed and split in a process pool
+    and upserted into Chroma in large batches while the pool keeps parsing.
+    Articles present in texts (e.g. articles.full_text) are chunked from that
+    text instead of re-parsing their PDF, and need no PDF at all.
+    """
+    settings = get_settings()
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    workers = workers or os.cpu_count() or 1
+    texts = texts or {}
+
+    paths = dict(articles)
+    sources = {
+        article_id: (paths.get(article_id) or f"articles/{article_id}", text_content_hash(text))
+        for article_id, text in texts.items()
+    }
+    for article_id, path in paths.items():
+        if article_id in sources:
+            continue
+        if not os.path.exists(path):
+            print(f"[!] Arquivo não encontrado: {path}")
+            continue
+        sources[article_id] = (path, file_content_hash(path))
+
+    vector_store = get_vectorstore()
+    indexed = indexed_articles(vector_store, sources.keys())
+    jobs = [
+        (article_id, path, content_hash, texts.get(article_id))
+        for article_id, (path, content_hash) in sources.items()
+        if indexed.get(article_id) != content_hash
+    ]
+    skipped = len(sources) - len(jobs)
+    print(f"{len(sources)} artigos, {skipped} já indexados, {len(jobs)} a processar com {workers} processos.")
+
+    pending: List["Document"] = []
+    pending_ids: List[str] = []
+    ingested_files = 0
+    ingested_chunks = 0
+    failed = 0
+
+    def flush():
+        nonlocal pending, pending_ids, ingested_chunks
+        if pending:
+            vector_store.add_documents(pending, ids=pending_ids)
+            ingested_chunks += len(pending)
+            pending, pending_ids = [], []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for article_id, path, chunks, error in executor.map(_load_and_split, jobs, chunksize=4):
+            if error:
+                failed += 1
+                print(f"[!] Falha ao processar {path}: {error}")
+                continue
+            # Flush first, so a batch never grows past batch_size (only an article
+            # with more chunks than that is written as one larger batch)
+            if pending and len(pending) + len(chunks) > batch_size:
+                flush()
+            pending_ids.extend(prepare_article_chunks(vector_store, article_id, chunks))
+            pending.extend(chunks)
+            ingested_files += 1
+            if len(pending) >= batch_size:
+                flush()
+        flush()
+
+    return f"Inseridos {ingested_files} PDFs ({ingested_chunks} chunks); {skipped} ignorados, {failed} falhas."
+
+def prune_articles(keep: Iterable[str]) -> str:
+    """Deletes the chunks of indexed articles not in keep (e.g. removed from the DB)."""
+    vector_store = get_vectorstore()
+    gone = indexed_article_ids(vector_store) - set(keep)
+    chunks = sum(delete_article(vector_store, article_id) for article_id in sorted(gone))
+    return f"Removidos {len(gone)} artigos ({chunks} chunks) que não estão mais no banco."
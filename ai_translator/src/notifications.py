@@ -0,0 +1,78 @@
+import logging
+import select
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from src.config import get_settings
+from src.db import get_db_engine
+
+logger = logging.getLogger(__name__)
+
+def notify_articles_pending(session, article_id: str) -> None:
+    """Queues a wakeup for listening translators; delivered when the session commits."""
+    session.execute(
+        text("SELECT pg_notify(:channel, :id)"),
+        {"channel": get_settings().ARTICLES_CHANNEL, "id": article_id},
+    )
+
+class ArticleListener:
+    """
+    Blocks on LISTEN for the articles channel so the translator loop wakes as soon
+    as the scraper commits an article. The connection is re-opened after errors;
+    while it is down, wait() just sleeps, which degrades to plain polling.
+    """
+
+    def __init__(self, channel: Optional[str] = None):
+        self.channel = channel or get_settings().ARTICLES_CHANNEL
+        self._engine = get_db_engine()
+        self._conn = None
+
+    def _connect(self) -> bool:
+        if self._conn is not None:
+            return True
+        if self._engine.dialect.name != "postgresql":
+            return False
+        try:
+            raw = self._engine.raw_connection()
+            dbapi_conn = raw.dbapi_connection
+            dbapi_conn.autocommit = True
+            with dbapi_conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            self._raw, self._conn = raw, dbapi_conn
+            logger.info(f"Listening for new articles on channel '{self.channel}'")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not LISTEN on '{self.channel}', falling back to polling: {e}")
+            return False
+
+    def _drain(self) -> List[str]:
+        self._conn.poll()
+        payloads = [notification.payload for notification in self._conn.notifies]
+        self._conn.notifies.clear()
+        return payloads
+
+    def wait(self, timeout: float) -> List[str]:
+        """Waits up to timeout seconds; returns the article IDs notified (empty on timeout)."""
+        if not self._connect():
+            time.sleep(timeout)
+            return []
+        try:
+            pending = self._drain()
+            if pending:
+                return pending
+            ready, _, _ = select.select([self._conn], [], [], max(0.0, timeout))
+            return self._drain() if ready else []
+        except Exception as e:
+            logger.warning(f"LISTEN connection lost: {e}")
+            self.close()
+            return []
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._raw.invalidate()
+            except Exception:
+                pass
+            self._raw = self._conn = None
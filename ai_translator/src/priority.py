@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, func
+
+from src.config import get_settings
+from src.db import Article
+
+def next_digest_at(now: Optional[datetime] = None) -> datetime:
+    """Next weekly digest cutoff (DIGEST_WEEKDAY at DIGEST_HOUR, UTC)."""
+    settings = get_settings()
+    now = now or datetime.now(timezone.utc)
+    cutoff = now.replace(hour=settings.DIGEST_HOUR, minute=0, second=0, microsecond=0)
+    cutoff += timedelta(days=(settings.DIGEST_WEEKDAY - now.weekday()) % 7)
+    if cutoff <= now:
+        cutoff += timedelta(days=7)
+    return cutoff
+
+def priority_expression(now: Optional[datetime] = None):
+    """
+    SQL priority of a pending article: scraper relevance plus an ageing term so
+    low-scored papers are not starved, plus a boost for papers that would be in
+    the upcoming weekly digest once it is less than PRIORITY_DEADLINE_HORIZON
+    hours away.
+    """
+    settings = get_settings()
+    now = now or datetime.now(timezone.utc)
+    created_at = func.coalesce(Article.created_at, now)
+    age_hours = func.extract("epoch", now - created_at) / 3600.0
+
+    priority = (
+        func.coalesce(Article.relevance_score, 0.0) * settings.PRIORITY_RELEVANCE_WEIGHT
+        + age_hours * settings.PRIORITY_AGE_WEIGHT
+    )
+
+    cutoff = next_digest_at(now)
+    if cutoff - now <= timedelta(hours=settings.PRIORITY_DEADLINE_HORIZON):
+        # Same window as /api/newsletter/weekly-digest (created in the last DIGEST_WINDOW_DAYS)
+        window_start = cutoff - timedelta(days=settings.DIGEST_WINDOW_DAYS)
+        priority = priority + case(
+            (created_at >= window_start, settings.PRIORITY_DEADLINE_BOOST), else_=0.0
+        )
+    return priority
+
+def estimated_tokens_expression():
+    """Rough prompt + completion tokens of one translation (the prompt is capped by CONTEXT_TOKEN_BUDGET)."""
+    settings = get_settings()
+    prompt_tokens = func.least(func.length(Article.full_text) / 4, settings.CONTEXT_TOKEN_BUDGET)
+    return prompt_tokens + settings.TRANSLATION_OUTPUT_TOKENS_ESTIMATE
+
+def within_budget(ranked: Sequence[Tuple[str, int]], token_budget: Optional[int]) -> List[str]:
+    """
+    Longest prefix of the priority-ordered (article_id, estimated_tokens) list
+    that fits the budget. Stops at the first article that does not fit, so a
+    cheap low-priority paper never jumps ahead of an expensive important one;
+    the top article is always taken so the queue cannot stall.
+    """
+    if token_budget is None:
+        return [article_id for article_id, _ in ranked]
+    selected, spent = [], 0
+    for article_id, tokens in ranked:
+        if selected and spent + tokens > token_budget:
+            break
+        selected.append(article_id)
+        spent += tokens
+    return selected
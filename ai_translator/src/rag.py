@@ -1,24 +1,18 @@
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
-
-from src.config import get_llm, get_embeddings, get_settings
-
-def get_vectorstore():
-    from langchain_chroma import Chroma
-    settings = get_settings()
-    embeddings = get_embeddings()
-    return Chroma(
-        persist_directory=settings.CHROMA_PERSIST_DIRECTORY,
-        embedding_function=embeddings
-    )
 
-def get_retriever():
-    vectorstore = get_vectorstore()
-    return vectorstore.as_retriever(search_kwargs={"k": 7})
+from src.config import LLMProvider, cached_client, get_llm, get_settings
+from src.context import build_article_context, estimate_tokens, select_context
+from src.router import get_router
+from src.vectorstore import article_filter, get_vectorstore
 
-def format_docs(docs):
-    return "\n\n".join(doc.page_content for doc in docs)
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+    from src.router import Route
+    from src.telemetry import TranslationRun
 
 FINAL_PROMPT_TEMPLATE = """You are an expert science communicator and translator. Your goal is to explain complex scientific concepts
 from the provided research paper in a clear, accessible, and friendly way to a general audience, while maintaining accuracy.
@@ -52,33 +46,242 @@ Text to process:
 
 Answer (in accessible, friendly, yet accurate markdown):"""
 
-def query_rag(query: str = "Provide a comprehensive summary of this research paper") -> str:
-    llm = get_llm()
-    retriever = get_retriever()
-    
+QA_PROMPT_TEMPLATE = """You are an expert science communicator. Answer the question using only the excerpts
+of research papers below. If they do not contain the answer, say so instead of guessing.
+Be concise, accessible and accurate, and answer in the language of the question.
+
+Excerpts:
+{context}
+
+Question: {question}
+
+Answer (markdown):"""
+
+# Shared, audience-neutral prefix of the per-audience prompts; the audience comes last
+VARIANT_CONTEXT_TEMPLATE = """You are an expert science communicator and translator. Your goal is to explain complex scientific concepts
+from the provided research paper in a clear, accessible way to the audience described in the next message, while maintaining accuracy.
+
+Analyse the provided text and generate a comprehensive summary in markdown structured into the following sections:
+
+# Title & Overview
+## 1. Introduction & Problem Statement
+## 2. Methodology & Approach
+## 3. Key Results & Findings
+## 4. Conclusion & Implications
+
+Text to process:
+{context}"""
+
+AUDIENCE_INSTRUCTIONS = {
+    "student": "Write the summary for an undergraduate student: define technical terms when they first appear, "
+               "explain the intuition behind the method and point out the background concepts worth studying.",
+    "educator": "Write the summary for an educator preparing a class: highlight the key concepts, a simple example "
+                "or analogy for each section, and questions that could be used for discussion.",
+    "enthusiast": "Write the summary for a curious non-specialist: avoid jargon, favour everyday analogies and "
+                  "focus on why the results matter in the real world.",
+}
+
+# The generic simplified_text is one more "audience" over the same shared prefix
+GENERAL_INSTRUCTION = ("Write the summary for a general audience: give a catchy title and a brief overview, explain "
+                       "the context and why the problem matters, describe the methods simply, include specific "
+                       "interesting findings and say how the results impact the field or the real world. "
+                       "Be clear, accessible and friendly, yet accurate.")
+
+RESUME_INSTRUCTION = """Your previous answer was interrupted. Continue it exactly where it stopped,
+keeping the same structure. Do not repeat anything that was already written and do not add any preamble."""
+
+@cached_client
+def get_summary_model_chain(provider: Optional[LLMProvider] = None, model: Optional[str] = None):
+    """Prompt -> LLM chain returning the message itself (content plus usage_metadata)."""
     prompt = ChatPromptTemplate.from_template(FINAL_PROMPT_TEMPLATE)
-    
-    rag_chain = (
-        {"context": retriever | format_docs, "query": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
+    return prompt | get_llm(provider, model)
+
+@cached_client
+def get_summary_chain():
+    """Prompt -> LLM -> text chain for query_rag's full summary."""
+    return get_summary_model_chain() | StrOutputParser()
+
+@cached_client
+def get_qa_chain():
+    """Prompt -> LLM -> text chain answering a {question} over retrieved {context}."""
+    prompt = ChatPromptTemplate.from_template(QA_PROMPT_TEMPLATE)
+    return prompt | get_llm() | StrOutputParser()
+
+def _message_text(message) -> str:
+    if isinstance(message.content, str):
+        return message.content
+    return "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in message.content
+    )
+
+def query_rag(
+    query: Optional[str] = None,
+    article_id: Optional[str] = None,
+    k: Optional[int] = None,
+) -> str:
+    """
+    Answers query from its top k chunks (article_id restricts retrieval to that
+    paper). Without a query, returns the structured summary of the paper built
+    from the chunks relevant to each section.
+    """
+    settings = get_settings()
+    vectorstore = get_vectorstore()
+    k = k or settings.CONTEXT_CHUNKS_PER_SECTION
+    search_filter = article_filter(article_id)
+
+    if query:
+        docs = vectorstore.similarity_search(query, k=k, filter=search_filter)
+        context = "\n\n".join(doc.page_content for doc in docs)
+        return get_qa_chain().invoke({"question": query, "context": context})
+
+    context = select_context(
+        lambda q: vectorstore.similarity_search(q, k=k, filter=search_filter),
+        settings.CONTEXT_TOKEN_BUDGET,
     )
+    return get_summary_chain().invoke({"context": context})
+
+def _routed_invoke(
+    candidates: List["Route"],
+    call: Callable[["Route"], Any],
+    run: Optional["TranslationRun"] = None,
+) -> Tuple["Route", Any]:
+    """
+    Runs call(route) on the first candidate with free capacity, failing over to
+    the next one on rate limits, timeouts and outages. Returns (route, result).
+    """
+    router = get_router()
+    remaining = list(candidates)
+    while True:
+        route = router.acquire_any(remaining)
+        remaining.remove(route)
+        if run is not None:
+            run.provider, run.model = route.provider.value, route.model
+        started = time.monotonic()
+        try:
+            result = call(route)
+        except Exception as e:
+            if not router.record_failure(route, e) or not remaining:
+                raise
+            continue
+        finally:
+            router.release(route)
 
-    return rag_chain.invoke(query)
+        router.record_success(route, time.monotonic() - started)
+        return route, result
 
-def translate_text(text: str) -> str:
+def variant_messages(context: str, audience: Optional[str], provider: LLMProvider) -> List["BaseMessage"]:
     """
-    Translates/Simplifies the given text using the LLM directly, bypassing retrieval.
+    The paper goes in a system message that is byte-identical for the generic
+    translation (audience None) and every audience, and only the short
+    instruction follows it, so provider prompt caching serves the shared prefix
+    after the first call (automatic on OpenAI; Anthropic needs the explicit
+    cache_control breakpoint).
     """
-    llm = get_llm()
-    prompt = ChatPromptTemplate.from_template(FINAL_PROMPT_TEMPLATE)
-    
-    chain = (
-        {"context": lambda x: x}
-        | prompt
-        | llm
-        | StrOutputParser()
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    shared = VARIANT_CONTEXT_TEMPLATE.format(context=context)
+    if provider == LLMProvider.ANTHROPIC:
+        system = SystemMessage(content=[{"type": "text", "text": shared, "cache_control": {"type": "ephemeral"}}])
+    else:
+        system = SystemMessage(content=shared)
+    instruction = AUDIENCE_INSTRUCTIONS[audience] if audience else GENERAL_INSTRUCTION
+    return [system, HumanMessage(content=instruction)]
+
+class ArticlePrompt:
+    """
+    Context and route candidates of one article, shared by its generic
+    translation and its audience variants. The context is built once, and every
+    call goes first to the route that served the previous one, whose prompt
+    cache already holds the paper.
+    """
+
+    def __init__(self, text: str):
+        self.context = build_article_context(text)
+        self.candidates = get_router().plan(estimate_tokens(self.context))
+
+    def messages(self, audience: Optional[str], provider: LLMProvider) -> List["BaseMessage"]:
+        return variant_messages(self.context, audience, provider)
+
+    def served_by(self, route: "Route") -> None:
+        self.candidates = [route] + [candidate for candidate in self.candidates if candidate != route]
+
+def _invoke_audience(prompt: ArticlePrompt, audience: Optional[str], run: Optional["TranslationRun"]) -> str:
+    route, message = _routed_invoke(
+        prompt.candidates,
+        lambda route: get_llm(route.provider, route.model).invoke(prompt.messages(audience, route.provider)),
+        run,
     )
-    
-    return chain.invoke(text)
\ No newline at end of file
+    prompt.served_by(route)
+    if run is not None:
+        # No time to first token without streaming: it would just repeat the latency
+        run.add_usage(message.usage_metadata)
+    return _message_text(message)
+
+def translate_text(prompt: ArticlePrompt, run: Optional["TranslationRun"] = None) -> str:
+    """
+    Translates/Simplifies the article for a general audience. Long papers are
+    reduced to the chunks relevant to each summary section (see src.context).
+    The provider/model is chosen by the router, which fails over on rate limits,
+    timeouts and outages.
+    """
+    return _invoke_audience(prompt, None, run)
+
+def translate_variants(
+    prompt: ArticlePrompt,
+    audiences: Sequence[str],
+    run: Optional["TranslationRun"] = None,
+) -> Dict[str, str]:
+    """
+    One simplified version per audience (see AUDIENCE_INSTRUCTIONS), sent back
+    to back on the route that served the generic translation of the same
+    prompt, so only the first call pays for the full paper prompt.
+    """
+    return {audience: _invoke_audience(prompt, audience, run) for audience in audiences}
+
+async def astream_translation(
+    prompt: ArticlePrompt,
+    resume_from: str = "",
+    run: Optional["TranslationRun"] = None,
+) -> AsyncIterator[str]:
+    """
+    Streaming version of translate_text. When resume_from holds a partial answer
+    (e.g. checkpointed before a crash), only the continuation is generated. If a
+    provider fails mid-stream, the next route resumes from what was already yielded.
+    """
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    router = get_router()
+    candidates = list(prompt.candidates)
+    produced = [resume_from] if resume_from else []
+
+    while True:
+        route = await router.aacquire_any(candidates)
+        candidates.remove(route)
+        if run is not None:
+            run.provider, run.model = route.provider.value, route.model
+        started = time.monotonic()
+        try:
+            messages = prompt.messages(None, route.provider)
+            if produced:
+                messages += [AIMessage(content="".join(produced)), HumanMessage(content=RESUME_INSTRUCTION)]
+
+            async for chunk in get_llm(route.provider, route.model).astream(messages):
+                if run is not None:
+                    run.add_usage(chunk.usage_metadata)
+                token = _message_text(chunk)
+                if token:
+                    if run is not None:
+                        run.mark_token()
+                    produced.append(token)
+                    yield token
+        except Exception as e:
+            if not router.record_failure(route, e) or not candidates:
+                raise
+            continue
+        finally:
+            router.release(route)
+
+        router.record_success(route, time.monotonic() - started)
+        prompt.served_by(route)
+        return
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from src.config import (
+    LLMProvider,
+    cached_client,
+    get_fast_model_name,
+    get_model_name,
+    get_settings,
+    is_provider_configured,
+)
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying on another provider: rate limits, overload and gateway errors
+FAILOVER_STATUS_CODES = {408, 429, 500, 502, 503, 504, 529}
+FAILOVER_ERROR_NAMES = ("RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError", "OverloadedError")
+
+@dataclass(frozen=True)
+class Route:
+    provider: LLMProvider
+    model: str
+    fast: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider.value}/{self.model}"
+
+@dataclass
+class RouteStats:
+    """Rolling latency and outcome window of one (provider, model)."""
+    window: int
+    latencies: Deque[float] = field(init=False)
+    outcomes: Deque[bool] = field(init=False)
+    cooldown_until: float = 0.0
+
+    def __post_init__(self):
+        self.latencies = deque(maxlen=self.window)
+        self.outcomes = deque(maxlen=self.window)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return statistics.median(self.latencies) if self.latencies else None
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def cooling_down(self, now: float) -> bool:
+        return now < self.cooldown_until
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    for candidate in (error, getattr(error, "response", None)):
+        code = getattr(candidate, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+def is_failover_error(error: BaseException) -> bool:
+    """Rate limits, timeouts and provider-side outages; prompt/auth errors are not retried elsewhere."""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if status_code_of(error) in FAILOVER_STATUS_CODES:
+        return True
+    name = type(error).__name__
+    return name in FAILOVER_ERROR_NAMES or "Timeout" in name
+
+def is_rate_limit(error: BaseException) -> bool:
+    return status_code_of(error) == 429 or type(error).__name__ == "RateLimitError"
+
+class ProviderRouter:
+    """
+    Picks the (provider, model) for each translation. Short papers go to the fast
+    models first; within a tier routes are ordered by rolling p95 latency weighted
+    by error rate, rate-limited routes cool down, and each provider has a cap on
+    in-flight requests.
+    """
+
+    def __init__(
+        self,
+        routes: List[Route],
+        concurrency: Dict[str, int],
+        short_paper_tokens: int,
+        window: int = 50,
+        cooldown: float = 60.0,
+    ):
+        if not routes:
+            raise ValueError("Nenhum provedor LLM configurado para o roteador")
+        self.routes = routes
+        self.short_paper_tokens = short_paper_tokens
+        self.cooldown = cooldown
+        self.stats = {route: RouteStats(window) for route in routes}
+        self._slots = {
+            provider: threading.BoundedSemaphore(concurrency.get(provider.value, 1))
+            for provider in {route.provider for route in routes}
+        }
+        self._lock = threading.Lock()
+
+    def _score(self, route: Route) -> float:
+        stats = self.stats[route]
+        # Unmeasured routes score 0 so they get tried (and measured) early
+        return (stats.p95 or 0.0) * (1 + 4 * stats.error_rate)
+
+    def plan(self, input_tokens: int) -> List[Route]:
+        """Routes to try in order for a paper whose prompt is about input_tokens long."""
+        now = time.monotonic()
+        prefer_fast = input_tokens <= self.short_paper_tokens
+        with self._lock:
+            return sorted(
+                self.routes,
+                key=lambda route: (
+                    self.stats[route].cooling_down(now),
+                    route.fast != prefer_fast,
+                    self._score(route),
+                ),
+            )
+
+    def try_acquire(self, route: Route) -> bool:
+        return self._slots[route.provider].acquire(blocking=False)
+
+    def release(self, route: Route) -> None:
+        self._slots[route.provider].release()
+
+    def _first_available(self, candidates: List[Route]) -> Optional[Route]:
+        for route in candidates:
+            if self.try_acquire(route):
+                return route
+        return None
+
+    def acquire_any(self, candidates: List[Route]) -> Route:
+        """Takes a slot on the first candidate with capacity, waiting while all are saturated."""
+        while (route := self._first_available(candidates)) is None:
+            time.sleep(0.05)
+        return route
+
+    async def aacquire_any(self, candidates: List[Route]) -> Route:
+        while (route := self._first_available(candidates)) is None:
+            await asyncio.sleep(0.05)
+        return route
+
+    def record_success(self, route: Route, latency: float) -> None:
+        with self._lock:
+            stats = self.stats[route]
+            stats.latencies.append(latency)
+            stats.outcomes.append(True)
+
+    def record_failure(self, route: Route, error: BaseException) -> bool:
+        """Records the error; returns True if the request should move to another route."""
+        with self._lock:
+            stats = self.stats[route]
+            stats.outcomes.append(False)
+            if is_rate_limit(error):
+                stats.cooldown_until = time.monotonic() + self.cooldown
+        failover = is_failover_error(error)
+        if failover:
+            logger.warning(f"Provider {route.name} failed ({type(error).__name__}: {error})")
+        return failover
+
+    def snapshot(self) -> List[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "route": route.name,
+                    "fast": route.fast,
+                    "requests": len(stats.outcomes),
+                    "p50": stats.p50,
+                    "p95": stats.p95,
+                    "error_rate": stats.error_rate,
+                    "cooling_down": stats.cooling_down(now),
+                }
+                for route, stats in self.stats.items()
+            ]
+
+def configured_routes() -> List[Route]:
+    """Primary and fast routes of every provider in ROUTER_PROVIDERS that has credentials."""
+    settings = get_settings()
+    if settings.LLM_ROUTING:
+        providers = [LLMProvider(name.strip()) for name in settings.ROUTER_PROVIDERS.split(",") if name.strip()]
+    else:
+        providers = [settings.LLM_PROVIDER]
+
+    routes = []
+    for provider in providers:
+        # Without routing a missing key should surface as get_llm's error, not an empty router
+        if settings.LLM_ROUTING and not is_provider_configured(provider):
+            continue
+        model = get_model_name(provider)
+        routes.append(Route(provider, model))
+        fast_model = get_fast_model_name(provider)
+        if settings.LLM_ROUTING and fast_model and fast_model != model:
+            routes.append(Route(provider, fast_model, fast=True))
+    return routes
+
+@cached_client
+def get_router() -> ProviderRouter:
+    """Process-wide router; with LLM_ROUTING off it has the single LLM_PROVIDER route."""
+    settings = get_settings()
+    return ProviderRouter(
+        configured_routes(),
+        concurrency=settings.ROUTER_CONCURRENCY,
+        short_paper_tokens=settings.ROUTER_SHORT_PAPER_TOKENS,
+        window=settings.ROUTER_WINDOW,
+        cooldown=settings.ROUTER_COOLDOWN,
+    )
@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import socketserver
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from src.config import get_settings
+from src.embeddings import get_query_cached_embeddings
+from src.rag import get_qa_chain, get_summary_chain, query_rag
+from src.vectorstore import article_filter, get_vectorstore
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1 << 20
+# Largest k accepted by /search and /query
+MAX_K = 20
+
+def warm_up() -> None:
+    """Opens the vector store and builds the embedder and chains before the first request."""
+    started = time.monotonic()
+    get_vectorstore()
+    get_qa_chain()
+    get_summary_chain()
+    logger.info(f"RAG service warm ({time.monotonic() - started:.2f}s)")
+
+def parse_k(payload: dict, default: int) -> int:
+    """The request's k, clamped to MAX_K; ValueError when it is not a positive integer."""
+    try:
+        k = int(payload.get("k", default))
+    except (TypeError, ValueError):
+        raise ValueError("k must be a positive integer")
+    if k < 1:
+        raise ValueError("k must be a positive integer")
+    return min(k, MAX_K)
+
+def search_chunks(query: str, article_id: Optional[str] = None, k: int = 5) -> list:
+    docs = get_vectorstore().similarity_search(query, k=k, filter=article_filter(article_id))
+    return [{"content": doc.page_content, "metadata": doc.metadata} for doc in docs]
+
+class RAGRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API over the warm process:
+      GET  /health                            -> query-embedding cache stats
+      POST /search {query, article_id?, k?}   -> matching chunks (no LLM call)
+      POST /query  {query?, article_id?, k?}  -> answer to query over its top k chunks
+                                                 (without query: the paper's structured summary)
+    k defaults to 5 and is capped at MAX_K.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object")
+        return payload
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_json(404, {"detail": "Not found"})
+        self._send_json(200, {
+            "status": "ok",
+            "query_embedding_cache": get_query_cached_embeddings().stats(),
+        })
+
+    def do_POST(self):
+        if self.path not in ("/query", "/search"):
+            return self._send_json(404, {"detail": "Not found"})
+        try:
+            payload = self._read_json()
+            k = parse_k(payload, 5)
+        except ValueError as e:
+            return self._send_json(400, {"detail": str(e)})
+
+        started = time.monotonic()
+        try:
+            if self.path == "/search":
+                if not payload.get("query"):
+                    return self._send_json(400, {"detail": "query is required"})
+                result = {"chunks": search_chunks(payload["query"], payload.get("article_id"), k)}
+            else:
+                result = {"answer": query_rag(payload.get("query") or None, payload.get("article_id"), k)}
+        except Exception as e:
+            logger.error(f"Error handling {self.path}: {e}")
+            return self._send_json(500, {"detail": f"Failed to process request: {e}"})
+
+        result["latency"] = time.monotonic() - started
+        self._send_json(200, result)
+
+    def address_string(self) -> str:
+        # UNIX socket peers have no (host, port)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve(host: Optional[str] = None, port: Optional[int] = None, socket_path: Optional[str] = None) -> None:
+    """Runs the RAG service on host:port, or on a UNIX socket when socket_path is given."""
+    settings = get_settings()
+    warm_up()
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, RAGRequestHandler)
+        logger.info(f"RAG service listening on unix:{socket_path}")
+    else:
+        address = (host or settings.RAG_SERVICE_HOST, port or settings.RAG_SERVICE_PORT)
+        server = ThreadingHTTPServer(address, RAGRequestHandler)
+        logger.info(f"RAG service listening on http://{address[0]}:{address[1]}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
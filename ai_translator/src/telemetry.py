@@ -0,0 +1,150 @@
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from src.db import TranslationMetric
+
+# USD per 1M tokens (input, output). Models not listed (e.g. local Ollama) cost nothing.
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4-turbo": (10.00, 30.00),
+    "claude-3-opus-20240229": (15.00, 75.00),
+    "claude-3-5-sonnet-20240620": (3.00, 15.00),
+    "claude-3-5-sonnet-20241022": (3.00, 15.00),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+}
+
+# Fraction of the input price charged for prompt-cache hits
+CACHED_INPUT_PRICE_FACTOR: Dict[str, float] = {"openai": 0.5, "anthropic": 0.1}
+
+def estimate_cost(
+    provider: str,
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_input_tokens: int = 0,
+) -> Optional[float]:
+    if provider in ("ollama", "fake"):
+        return 0.0
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return None
+    input_price, output_price = pricing
+    cached_price = input_price * CACHED_INPUT_PRICE_FACTOR.get(provider, 1.0)
+    uncached_tokens = input_tokens - cached_input_tokens
+    return (
+        uncached_tokens * input_price + cached_input_tokens * cached_price + output_tokens * output_price
+    ) / 1_000_000
+
+@dataclass
+class TranslationRun:
+    """Collects timings and token usage while one article is being translated."""
+    article_id: str
+    provider: str
+    model: str
+    started_at: float = field(default_factory=time.monotonic)
+    first_token_at: Optional[float] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+
+    def mark_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+    def add_usage(self, usage_metadata: Optional[dict]) -> None:
+        """Accumulates LangChain's usage_metadata (summed over resumed/retried calls)."""
+        if not usage_metadata:
+            return
+        self.input_tokens += usage_metadata.get("input_tokens", 0) or 0
+        self.output_tokens += usage_metadata.get("output_tokens", 0) or 0
+        details = usage_metadata.get("input_token_details") or {}
+        self.cached_input_tokens += details.get("cache_read", 0) or 0
+
+    def to_metric(self, status: str, retries: int = 0, error: Optional[str] = None) -> TranslationMetric:
+        finished_at = time.monotonic()
+        return TranslationMetric(
+            article_id=self.article_id,
+            provider=self.provider,
+            model=self.model,
+            status=status,
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            cached_input_tokens=self.cached_input_tokens,
+            time_to_first_token=(self.first_token_at - self.started_at) if self.first_token_at else None,
+            latency=finished_at - self.started_at,
+            retries=retries,
+            estimated_cost=estimate_cost(
+                self.provider, self.model, self.input_tokens, self.output_tokens, self.cached_input_tokens
+            ),
+            error=error,
+        )
+
+def record_translation(session, run: TranslationRun, status: str, error: Optional[str] = None) -> TranslationMetric:
+    """Stores one attempt; retries counts the article's earlier failed attempts."""
+    retries = session.execute(
+        select(func.count(TranslationMetric.id)).where(
+            TranslationMetric.article_id == run.article_id,
+            TranslationMetric.status == "failed",
+        )
+    ).scalar_one()
+    metric = run.to_metric(status, retries=retries, error=error)
+    session.add(metric)
+    session.commit()
+    return metric
+
+def throughput_report(session, hours: float = 24) -> List[dict]:
+    """Rolling per-provider/model throughput, latency and cost over the last `hours`."""
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    succeeded = TranslationMetric.status == "success"
+    # Variant runs (status "variants"/"failed_variants") add tokens and cost, not translation latency
+    translation = TranslationMetric.status.in_(("success", "failed"))
+    stmt = (
+        select(
+            TranslationMetric.provider,
+            TranslationMetric.model,
+            func.count().filter(succeeded).label("translated"),
+            func.count().filter(TranslationMetric.status == "failed").label("failed"),
+            func.count().filter(TranslationMetric.status == "variants").label("variants"),
+            func.coalesce(func.sum(TranslationMetric.input_tokens), 0).label("input_tokens"),
+            func.coalesce(func.sum(TranslationMetric.output_tokens), 0).label("output_tokens"),
+            func.coalesce(func.sum(TranslationMetric.cached_input_tokens), 0).label("cached_input_tokens"),
+            func.sum(TranslationMetric.latency).label("total_latency"),
+            func.percentile_cont(0.5).within_group(TranslationMetric.latency).filter(translation).label("p50_latency"),
+            func.percentile_cont(0.95).within_group(TranslationMetric.latency).filter(translation).label("p95_latency"),
+            func.avg(TranslationMetric.time_to_first_token).label("avg_ttft"),
+            func.coalesce(func.sum(TranslationMetric.estimated_cost), 0).label("cost"),
+        )
+        .where(TranslationMetric.created_at >= since)
+        .group_by(TranslationMetric.provider, TranslationMetric.model)
+        .order_by(TranslationMetric.provider, TranslationMetric.model)
+    )
+
+    report = []
+    for row in session.execute(stmt).mappings():
+        total_latency = row["total_latency"] or 0
+        report.append({
+            **row,
+            "articles_per_hour": row["translated"] / hours,
+            "output_tokens_per_sec": row["output_tokens"] / total_latency if total_latency else 0.0,
+        })
+    return report
+
+def format_report(report: List[dict], hours: float) -> str:
+    if not report:
+        return f"No translations recorded in the last {hours:g}h."
+    lines = [f"Translation throughput over the last {hours:g}h:"]
+    for row in report:
+        ttft = f"{row['avg_ttft']:.2f}s" if row["avg_ttft"] is not None else "n/a"
+        lines.append(
+            f"- {row['provider']}/{row['model']}: {row['translated']} ok, {row['failed']} failed, {row['variants']} variant sets | "
+            f"{row['articles_per_hour']:.2f} articles/h, {row['output_tokens_per_sec']:.1f} out tok/s | "
+            f"p50 {row['p50_latency'] or 0:.1f}s, p95 {row['p95_latency'] or 0:.1f}s, TTFT {ttft} | "
+            f"{row['input_tokens']} in ({row['cached_input_tokens']} cached) / {row['output_tokens']} out tokens, "
+            f"${row['cost']:.4f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,93 @@
+import os
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
+
+from src.config import cached_client, get_settings
+
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+    from langchain_core.documents import Document
+
+@cached_client
+def get_vectorstore() -> "Chroma":
+    """
+    Process-wide Chroma client, so the on-disk index is opened once. Queries go
+    through the LRU query-embedding cache, documents through the disk cache.
+    """
+    # chromadb is heavy; only commands that touch the vector store pay for it
+    from langchain_chroma import Chroma
+    from src.embeddings import get_query_cached_embeddings
+
+    settings = get_settings()
+    return Chroma(
+        persist_directory=settings.CHROMA_PERSIST_DIRECTORY,
+        embedding_function=get_query_cached_embeddings()
+    )
+
+def article_id_from_path(file_path: str) -> str:
+    """The scraper stores PDFs as '<arxiv_id>.pdf', so the file stem is the article ID."""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+def chunk_id(article_id: str, chunk_index: int) -> str:
+    return f"{article_id}:{chunk_index}"
+
+def article_filter(article_id: Optional[str]) -> Optional[dict]:
+    return {"article_id": article_id} if article_id else None
+
+def indexed_articles(vectorstore: "Chroma", article_ids: Iterable[str], batch_size: int = 500) -> Dict[str, str]:
+    """
+    Maps each already-indexed article ID to the content hash of its indexed
+    source. Only the first chunk of each article is read (every chunk carries
+    the hash), batch_size IDs per query.
+    """
+    article_ids = list(article_ids)
+    hashes = {}
+    for start in range(0, len(article_ids), batch_size):
+        batch = article_ids[start:start + batch_size]
+        result = vectorstore.get(
+            where={"$and": [{"article_id": {"$in": batch}}, {"chunk_index": 0}]},
+            include=["metadatas"],
+        )
+        hashes.update(
+            (metadata["article_id"], metadata.get("content_hash"))
+            for metadata in result["metadatas"]
+            if metadata
+        )
+    return hashes
+
+def indexed_article_ids(vectorstore: "Chroma") -> Set[str]:
+    """Every article with chunks in the store (read from the first chunk of each)."""
+    result = vectorstore.get(where={"chunk_index": 0}, include=["metadatas"])
+    return {metadata["article_id"] for metadata in result["metadatas"] if metadata}
+
+def prepare_article_chunks(vectorstore: "Chroma", article_id: str, chunks: List["Document"]) -> List[str]:
+    """
+    Tags chunks with the article ID and index, deletes chunks left over from a
+    previous (longer) version of the article and returns the deterministic IDs
+    to upsert the new chunks with.
+    """
+    ids = []
+    for index, chunk in enumerate(chunks):
+        chunk.metadata["article_id"] = article_id
+        chunk.metadata["chunk_index"] = index
+        ids.append(chunk_id(article_id, index))
+
+    existing = vectorstore.get(where={"article_id": article_id}, include=[])["ids"]
+    stale = set(existing) - set(ids)
+    if stale:
+        vectorstore.delete(ids=list(stale))
+    return ids
+
+def upsert_article(vectorstore: "Chroma", article_id: str, chunks: List["Document"]) -> int:
+    """Replaces the article's chunks in place; re-ingesting never duplicates vectors."""
+    ids = prepare_article_chunks(vectorstore, article_id, chunks)
+    if chunks:
+        # Chroma writes with upsert, so existing IDs are overwritten
+        vectorstore.add_documents(chunks, ids=ids)
+    return len(chunks)
+
+def delete_article(vectorstore: "Chroma", article_id: str) -> int:
+    """Removes all chunks of the article. Returns how many."""
+    existing = vectorstore.get(where={"article_id": article_id}, include=[])["ids"]
+    if existing:
+        vectorstore.delete(ids=existing)
+    return len(existing)
@@ -4,7 +4,7 @@ from sqlalchemy import text
 import os
 
 # Importações Locais
-from modules.config import S2_API_KEY, PDF_STORAGE_PATH
+from modules.config import S2_API_KEY, PDF_STORAGE_PATH, ARTICLES_CHANNEL
 from modules.database import get_db_session
 from modules.network import get_robust_session
 from modules.text_utils import extract_full_text_from_pdf, calculate_relevance_score
@@ -155,7 +155,8 @@ def run_curation_pipeline():
                 stmt = text("""
                     INSERT INTO articles (id, title, authors, publication_date, abstract, keywords, full_text, source_url, original_pdf_path, processing_status, relevance_score)
                     VALUES (:id, :title, :authors, :publication_date, :abstract, :keywords, :full_text, :source_url, :original_pdf_path, :processing_status, :relevance_score)
-                    ON CONFLICT (id) DO NOTHING;
+                    ON CONFLICT (id) DO NOTHING
+                    RETURNING id;
                 """)
 
                 db_entry = {
@@ -171,7 +172,13 @@ def run_curation_pipeline():
                     "processing_status": 'parsed',
                     "relevance_score": paper['final_score']
                 }
-                session_db.execute(stmt, db_entry)
+                inserted_id = session_db.execute(stmt, db_entry).scalar()
+                if inserted_id:
+                    # Acorda o tradutor; o NOTIFY só é entregue no commit
+                    session_db.execute(
+                        text("SELECT pg_notify(:channel, :id)"),
+                        {"channel": ARTICLES_CHANNEL, "id": inserted_id}
+                    )
                 session_db.commit()
                 saved_count += 1
                 print("  [*] Salvo com sucesso.")
@@ -7,6 +7,8 @@ load_dotenv()
 S2_API_KEY = os.getenv("S2_API_KEY")
 DATABASE_URL = os.getenv("DATABASE_URL")
 PDF_STORAGE_PATH = "articles_pdf"
+# Canal LISTEN/NOTIFY em que o tradutor espera por artigos novos
+ARTICLES_CHANNEL = os.getenv("ARTICLES_CHANNEL", "articles_pending")
 
 # Cria a pasta de PDFs se não existir
 if not os.path.exists(PDF_STORAGE_PATH):
@@ -1,82 +1,157 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import base64
+import json
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional, List
 
-from app.db.supabase import get_supabase
-from app.schemas.article import ArticleResponse, ArticleListResponse
+from app.repositories import Cursor, get_repository
+from app.schemas.article import (
+    ArticleListItem,
+    ArticleListResponse,
+    ArticleResponse,
+    ArticleSearchResult,
+    ArticleSummary,
+)
+from app.schemas.user import ProfileType
+from app.core.cache import response_cache
 from app.core.security import get_current_user
 
 router = APIRouter()
 
 
+def _encode_cursor(article: dict) -> str:
+    """Opaque cursor pointing just after the given row in (publication_date DESC, id DESC) order"""
+    publication_date = article.get("publication_date")
+    if isinstance(publication_date, date):
+        publication_date = publication_date.isoformat()
+    payload = json.dumps({"d": publication_date, "i": article["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Cursor:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        publication_date, article_id = payload["d"], str(payload["i"])
+        if publication_date is not None:
+            publication_date = date.fromisoformat(publication_date).isoformat()
+        return publication_date, article_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/", response_model=ArticleListResponse)
 async def list_articles(
+    cursor: Optional[str] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
     topic: Optional[str] = None,
+    include_total: bool = False,
+    include_likes: bool = False,
     current_user: dict = Depends(get_current_user),
 ):
-    """List all articles with pagination and filtering"""
-    supabase = get_supabase()
+    """
+    List translated articles, newest first.
+
+    Pass the returned next_cursor to fetch the following page; it seeks on
+    (publication_date, id), so every page costs the same. `page` is kept for
+    old clients and still uses OFFSET. The total is only computed on request,
+    on the first page, over the same filters (a PostgREST estimate on Supabase).
+    With include_likes, each article also carries like_count and is_liked,
+    fetched for the whole page in one query.
+    """
+    repo = get_repository()
+    after = _decode_cursor(cursor) if cursor else None
     
     try:
-        # Build query
-        query = supabase.table("articles").select("*").eq("processing_status", "translated")
-        
-        if search:
-            # Search in title or abstract
-            query = query.or_(f"title.ilike.%{search}%,abstract.ilike.%{search}%")
-        
-        # Get total count
-        count_result = supabase.table("articles").select("id", count="exact").eq("processing_status", "translated").execute()
-        total = count_result.count if count_result.count else 0
+        # One extra row tells whether there is a next page
+        offset = 0 if after else (page - 1) * page_size
+        articles, total = await repo.list_articles(
+            limit=page_size + 1,
+            after=after,
+            offset=offset,
+            search=search,
+            include_total=include_total and after is None,
+        )
         
-        # Get paginated results
-        offset = (page - 1) * page_size
-        result = query.order("publication_date", desc=True).range(offset, offset + page_size - 1).execute()
+        next_cursor = _encode_cursor(articles[page_size - 1]) if len(articles) > page_size else None
+        items = [ArticleListItem.model_validate(a) for a in articles[:page_size]]
         
-        articles = result.data if result.data else []
+        if include_likes and items:
+            user_id = current_user.get("user_id") or current_user.get("id")
+            statuses = {s["article_id"]: s for s in await repo.like_statuses(user_id, [a.id for a in items])}
+            for item in items:
+                item.like_count = statuses.get(item.id, {}).get("like_count", 0)
+                item.is_liked = statuses.get(item.id, {}).get("is_liked", False)
         
         return ArticleListResponse(
-            articles=[ArticleResponse.model_validate(a) for a in articles],
+            articles=items,
             total=total,
             page=page,
             page_size=page_size,
+            next_cursor=next_cursor,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch articles: {str(e)}")
 
 
+@router.get("/search/", response_model=List[ArticleSearchResult])
+async def search_articles(
+    q: str = Query(..., min_length=2),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_current_user),
+):
+    """Full-text search (English or Portuguese) over title, keywords, abstract and simplified text, best match first"""
+    repo = get_repository()
+    
+    try:
+        articles = await repo.search_articles(q, limit, offset)
+        return [ArticleSearchResult.model_validate(a) for a in articles]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search articles: {str(e)}")
+
+
 @router.get("/{article_id}", response_model=ArticleResponse)
 async def get_article(
     article_id: str,
+    request: Request,
+    audience: Optional[ProfileType] = None,
     current_user: dict = Depends(get_current_user),
 ):
-    """Get a specific article by ID"""
-    supabase = get_supabase()
+    """Get a specific article by ID, optionally with the simplified text written for an audience"""
+    repo = get_repository()
     
-    try:
-        result = supabase.table("articles").select("*").eq("id", article_id).execute()
-        if not result.data or len(result.data) == 0:
+    async def load():
+        # Falls back to the generic simplified_text while the variant is not generated yet
+        article = await repo.get_article(article_id, audience.value if audience else None)
+        if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         
-        return ArticleResponse.model_validate(result.data[0])
+        return ArticleResponse.model_validate(article)
+    
+    try:
+        key = f"articles:detail:{article_id}:{audience.value if audience else ''}"
+        return await response_cache.respond(request, key, load)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch article: {str(e)}")
 
 
-@router.get("/latest/", response_model=List[ArticleResponse])
+@router.get("/latest/", response_model=List[ArticleSummary])
 async def get_latest_articles(
+    request: Request,
     limit: int = Query(10, ge=1, le=50),
 ):
     """Get latest articles (public endpoint for newsletter)"""
-    supabase = get_supabase()
+    repo = get_repository()
+    
+    async def load():
+        articles = await repo.latest_articles(limit)
+        return [ArticleSummary.model_validate(a) for a in articles]
     
     try:
-        result = supabase.table("articles").select("*").eq("processing_status", "completed").order("publication_date", desc=True).limit(limit).execute()
-        articles = result.data if result.data else []
-        return [ArticleResponse.model_validate(a) for a in articles]
+        return await response_cache.respond(request, f"articles:latest:{limit}", load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch articles: {str(e)}")
@@ -3,7 +3,9 @@ from fastapi.security import OAuth2PasswordRequestForm
 from uuid import uuid4
 from datetime import datetime
 
-from app.db.supabase import get_supabase
+from app.core.concurrency import run_blocking
+from app.core.profiles import cache_profile, get_profile
+from app.repositories import get_repository
 from app.schemas.user import UserCreate, UserLogin, UserResponse, TokenResponse
 from app.core.security import (
     get_password_hash,
@@ -20,12 +22,11 @@ router = APIRouter()
 @router.post("/register", response_model=TokenResponse)
 async def register(user_data: UserCreate):
     """Register a new user"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
         # Check if user exists
-        existing_user = supabase.table("users").select("id").eq("email", user_data.email).execute()
-        if existing_user.data and len(existing_user.data) > 0:
+        if await repo.get_user_by_email(user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
@@ -45,14 +46,13 @@ async def register(user_data: UserCreate):
         user_data_insert = {
             "id": user_id,
             "email": user_data.email,
-            "password_hash": get_password_hash(user_data.password),
+            "password_hash": await run_blocking(get_password_hash, user_data.password),
             "name": user_data.name,
             "profile_type": user_data.profile_type,
             "created_at": datetime.utcnow().isoformat(),
         }
         
-        result = supabase.table("users").insert(user_data_insert).execute()
-        user = result.data[0] if result.data else None
+        user = await repo.create_user(user_data_insert)
         
         if not user:
             raise HTTPException(
@@ -64,17 +64,13 @@ async def register(user_data: UserCreate):
         access_token = create_access_token(data={"sub": user_id, "email": user_data.email})
         refresh_token = create_refresh_token(data={"sub": user_id})
         
+        # The first /me after signing up is then a cache hit
+        profile = await cache_profile({**user, "subscribed_topics": []})
+        
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
-            user=UserResponse(
-                id=user_id,
-                email=user_data.email,
-                name=user_data.name,
-                profile_type=user_data.profile_type,
-                subscribed_topics=[],
-                created_at=user.get("created_at"),
-            )
+            user=UserResponse.model_validate(profile),
         )
     except Exception as e:
         raise HTTPException(
@@ -86,23 +82,21 @@ async def register(user_data: UserCreate):
 @router.post("/login", response_model=TokenResponse)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Login with email and password"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
         # Find user by email
-        user_result = supabase.table("users").select("*").eq("email", form_data.username).execute()
+        user = await repo.get_user_by_email(form_data.username)
         
-        if not user_result.data or len(user_result.data) == 0:
+        if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        user = user_result.data[0]
-        
         # Verify password
-        if not verify_password(form_data.password, user.get("password_hash", "")):
+        if not await run_blocking(verify_password, form_data.password, user.get("password_hash", "")):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
@@ -113,21 +107,13 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         access_token = create_access_token(data={"sub": user["id"], "email": user["email"]})
         refresh_token = create_refresh_token(data={"sub": user["id"]})
         
-        # Get subscribed topics
-        subscriptions = supabase.table("subscriptions").select("topic_id").eq("user_id", user["id"]).execute()
-        subscribed_topic_ids = [str(sub["topic_id"]) for sub in subscriptions.data] if subscriptions.data else []
+        # Subscribed topics came with the user row; warm the cache for /me
+        profile = await cache_profile(user)
         
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
-            user=UserResponse(
-                id=user["id"],
-                email=user["email"],
-                name=user["name"],
-                profile_type=user.get("profile_type"),
-                subscribed_topics=subscribed_topic_ids,
-                created_at=user.get("created_at"),
-            )
+            user=UserResponse.model_validate(profile),
         )
     except HTTPException:
         raise
@@ -149,17 +135,16 @@ async def refresh_access_token(refresh_token: str):
         )
     
     user_id = payload.get("sub")
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
-        user_result = supabase.table("users").select("*").eq("id", user_id).execute()
-        if not user_result.data or len(user_result.data) == 0:
+        user = await repo.get_user(user_id)
+        if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        user = user_result.data[0]
         access_token = create_access_token(data={"sub": user["id"], "email": user["email"]})
         return {"access_token": access_token, "token_type": "bearer"}
     except HTTPException:
@@ -174,30 +159,16 @@ async def refresh_access_token(refresh_token: str):
 @router.get("/me", response_model=UserResponse)
 async def get_me(current_user: dict = Depends(get_current_user)):
     """Get current user info"""
-    supabase = get_supabase()
-    
     try:
-        user_result = supabase.table("users").select("*").eq("id", current_user["user_id"]).execute()
-        if not user_result.data or len(user_result.data) == 0:
+        # Cached per user; a miss is one query for the user and subscribed topic IDs
+        profile = await get_profile(current_user["user_id"])
+        if not profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        user = user_result.data[0]
-        
-        # Get subscribed topics
-        subscriptions = supabase.table("subscriptions").select("topic_id").eq("user_id", user["id"]).execute()
-        subscribed_topic_ids = [str(sub["topic_id"]) for sub in subscriptions.data] if subscriptions.data else []
-        
-        return UserResponse(
-            id=user["id"],
-            email=user["email"],
-            name=user["name"],
-            profile_type=user.get("profile_type"),
-            subscribed_topics=subscribed_topic_ids,
-            created_at=user.get("created_at"),
-        )
+        return UserResponse.model_validate(profile)
     except HTTPException:
         raise
     except Exception as e:
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List
 
-from app.db.supabase import get_supabase
+from app.repositories import get_repository
 from app.schemas.like import LikeResponse, LikeCountResponse
 from app.core.security import get_current_user
 from uuid import uuid4
@@ -8,6 +9,9 @@ from datetime import datetime
 
 router = APIRouter()
 
+# Largest batch for /likes/status/ (same as the article list page_size limit)
+MAX_LIKE_STATUS_IDS = 100
+
 
 @router.post("/articles/{article_id}/like/", response_model=LikeResponse)
 async def like_article(
@@ -15,37 +19,31 @@ async def like_article(
     current_user: dict = Depends(get_current_user)
 ):
     """Like an article"""
-    supabase = get_supabase()
+    repo = get_repository()
     user_id = current_user.get("user_id") or current_user.get("id")
     
     try:
-        # Check if article exists
-        article = supabase.table("articles").select("id").eq("id", article_id).execute()
-        if not article.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Artigo não encontrado"
-            )
-        
-        # Check if user already liked the article
-        existing_like = supabase.table("likes").select("id").eq("user_id", user_id).eq("article_id", article_id).execute()
-        
-        if existing_like.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Você já curtiu este artigo"
-            )
-        
-        # Create like
+        # Create like (INSERT ... ON CONFLICT DO NOTHING; the trigger bumps articles.like_count)
         like_data = {
             "id": str(uuid4()),
             "user_id": user_id,
             "article_id": article_id,
             "created_at": datetime.utcnow().isoformat(),
         }
+        like = await repo.like(like_data)
+        if like:
+            return like
         
-        result = supabase.table("likes").insert(like_data).execute()
-        return result.data[0] if result.data else like_data
+        # Nothing inserted: either the article does not exist or it was already liked
+        if not await repo.article_exists(article_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Artigo não encontrado"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Você já curtiu este artigo"
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -58,20 +56,16 @@ async def unlike_article(
     current_user: dict = Depends(get_current_user)
 ):
     """Unlike an article"""
-    supabase = get_supabase()
+    repo = get_repository()
     user_id = current_user.get("user_id") or current_user.get("id")
     
     try:
-        # Find and delete the like
-        like = supabase.table("likes").select("id").eq("user_id", user_id).eq("article_id", article_id).execute()
-        
-        if not like.data:
+        # Delete the like (DELETE ... RETURNING tells whether there was one)
+        if not await repo.unlike(user_id, article_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Você não havia curtido este artigo"
             )
-        
-        supabase.table("likes").delete().eq("user_id", user_id).eq("article_id", article_id).execute()
     except HTTPException:
         raise
     except Exception as e:
@@ -84,36 +78,55 @@ async def get_like_status(
     current_user: dict = Depends(get_current_user)
 ):
     """Get like count and user's like status for an article"""
-    supabase = get_supabase()
+    repo = get_repository()
     user_id = current_user.get("user_id") or current_user.get("id")
     
     try:
-        # Count total likes
-        all_likes = supabase.table("likes").select("id", count="exact").eq("article_id", article_id).execute()
-        like_count = all_likes.count if all_likes.count else 0
-        
-        # Check if current user liked the article
-        user_like = supabase.table("likes").select("id").eq("user_id", user_id).eq("article_id", article_id).execute()
-        is_liked = bool(user_like.data)
+        # Counter column plus the user's like, in one query
+        statuses = await repo.like_statuses(user_id, [article_id])
+        if not statuses:
+            return LikeCountResponse(article_id=article_id, like_count=0, is_liked=False)
         
-        return LikeCountResponse(
-            article_id=article_id,
-            like_count=like_count,
-            is_liked=is_liked
-        )
+        return LikeCountResponse(**statuses[0])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get like status: {str(e)}")
 
 
+@router.get("/likes/status/", response_model=List[LikeCountResponse])
+async def get_like_statuses(
+    ids: str = Query(..., description="Comma-separated article IDs"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get like counts and user's like status for several articles (e.g. a list page) in one query"""
+    repo = get_repository()
+    user_id = current_user.get("user_id") or current_user.get("id")
+    
+    article_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not article_ids:
+        raise HTTPException(status_code=400, detail="No article IDs given")
+    if len(article_ids) > MAX_LIKE_STATUS_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_LIKE_STATUS_IDS} article IDs per request")
+    
+    try:
+        statuses = {s["article_id"]: s for s in await repo.like_statuses(user_id, article_ids)}
+        
+        # Same order as requested; unknown articles count as not liked
+        return [
+            LikeCountResponse(**statuses.get(article_id, {"article_id": article_id, "like_count": 0, "is_liked": False}))
+            for article_id in article_ids
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get like statuses: {str(e)}")
+
+
 @router.get("/articles/{article_id}/likes/", response_model=LikeCountResponse)
 async def get_like_count_public(article_id: str):
     """Get like count for an article (public endpoint)"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
-        # Count total likes
-        all_likes = supabase.table("likes").select("id", count="exact").eq("article_id", article_id).execute()
-        like_count = all_likes.count if all_likes.count else 0
+        # Read the trigger-maintained counter instead of counting likes
+        like_count = await repo.count_likes(article_id)
         
         return LikeCountResponse(
             article_id=article_id,
@@ -1,35 +1,37 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 from datetime import datetime, timedelta
 
-from app.db.supabase import get_supabase
-from app.schemas.article import ArticleResponse
+from app.repositories import get_repository
+from app.core.cache import response_cache
+from app.schemas.article import ArticleSummary
 
 router = APIRouter()
 
 
 @router.get("/weekly-digest")
-async def get_weekly_digest():
+async def get_weekly_digest(request: Request):
     """
     Get articles for weekly newsletter digest
     Called by n8n workflow
     """
-    supabase = get_supabase()
+    repo = get_repository()
     
-    try:
+    async def load():
         one_week_ago = datetime.utcnow() - timedelta(days=7)
         
         # Query articles created in the last week with completed status
-        result = supabase.table("articles").select("*").eq("processing_status", "completed").gte("created_at", one_week_ago.isoformat()).order("created_at", desc=True).limit(20).execute()
-        
-        articles = result.data if result.data else []
+        articles = await repo.digest_articles(one_week_ago, 20)
         
         return {
-            "articles": [ArticleResponse.model_validate(a) for a in articles],
+            "articles": [ArticleSummary.model_validate(a) for a in articles],
             "total": len(articles),
             "week_start": one_week_ago.isoformat(),
             "week_end": datetime.utcnow().isoformat(),
         }
+    
+    try:
+        return await response_cache.respond(request, "newsletter:weekly-digest", load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch digest: {str(e)}")
 
@@ -40,37 +42,18 @@ async def get_article_subscribers(article_id: str):
     Get list of subscribers interested in an article's topics
     Called by n8n workflow for notifications
     """
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
-        # Get article
-        article_result = supabase.table("articles").select("*").eq("id", article_id).execute()
-        if not article_result.data:
+        # Get article and the users subscribed to topics matching its keywords
+        found = await repo.article_subscribers(article_id)
+        if not found:
             raise HTTPException(status_code=404, detail="Article not found")
         
-        article = article_result.data[0]
-        keywords = article.get("keywords", [])
-        
-        # Get topics matching article keywords
-        if not keywords:
+        article, users = found
+        if not users:
             return {"subscribers": [], "article_id": article_id}
         
-        # Query topics by slug
-        topics_result = supabase.table("topics").select("id").in_("slug", keywords).execute()
-        topic_ids = [t["id"] for t in topics_result.data] if topics_result.data else []
-        
-        if not topic_ids:
-            return {"subscribers": [], "article_id": article_id}
-        
-        # Get subscriptions for these topics
-        subscriptions_result = supabase.table("subscriptions").select("user_id").in_("topic_id", topic_ids).execute()
-        user_ids = list(set([sub["user_id"] for sub in subscriptions_result.data])) if subscriptions_result.data else []
-        
-        if not user_ids:
-            return {"subscribers": [], "article_id": article_id}
-        
-        # Get user details
-        users_result = supabase.table("users").select("id,email,name,profile_type").in_("id", user_ids).execute()
         subscribers = [
             {
                 "user_id": user["id"],
@@ -78,8 +61,8 @@ async def get_article_subscribers(article_id: str):
                 "name": user["name"],
                 "profile_type": user.get("profile_type", "researcher"),
             }
-            for user in users_result.data
-        ] if users_result.data else []
+            for user in users
+        ]
         
         return {
             "article_id": article_id,
@@ -99,16 +82,14 @@ async def get_social_post_content(article_id: str):
     Get formatted content for social media posting
     Called by n8n workflow for Twitter/LinkedIn
     """
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
         # Get article
-        article_result = supabase.table("articles").select("*").eq("id", article_id).execute()
-        if not article_result.data:
+        article = await repo.get_article_fields(article_id, ["id", "title", "abstract", "source_url", "keywords"])
+        if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         
-        article = article_result.data[0]
-        
         # Format for different platforms
         base_url = "https://scinewsai.com/article"
         abstract = article.get("abstract", "")
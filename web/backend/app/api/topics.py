@@ -1,22 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List
 
-from app.db.supabase import get_supabase
+from app.repositories import get_repository
 from app.schemas.topic import TopicResponse
+from app.core.cache import response_cache
+from app.core.profiles import invalidate_profile
 from app.core.security import get_current_user
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[TopicResponse])
-async def list_topics(current_user: dict = Depends(get_current_user)):
+async def list_topics(request: Request, current_user: dict = Depends(get_current_user)):
     """List all available topics"""
-    supabase = get_supabase()
+    repo = get_repository()
     
-    try:
-        result = supabase.table("topics").select("*").order("name").execute()
-        topics = result.data if result.data else []
+    async def load():
+        topics = await repo.list_topics()
         return [TopicResponse.model_validate(t) for t in topics]
+    
+    try:
+        return await response_cache.respond(request, "topics:list", load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch topics: {str(e)}")
 
@@ -27,28 +31,19 @@ async def subscribe_to_topic(
     current_user: dict = Depends(get_current_user),
 ):
     """Subscribe to a topic"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
         # Check if topic exists
-        topic_result = supabase.table("topics").select("*").eq("id", topic_id).execute()
-        if not topic_result.data:
+        topic = await repo.get_topic(topic_id)
+        if not topic:
             raise HTTPException(status_code=404, detail="Topic not found")
         
-        topic = topic_result.data[0]
-        
-        # Check if already subscribed
-        existing = supabase.table("subscriptions").select("id").eq("user_id", current_user["user_id"]).eq("topic_id", topic_id).execute()
-        
-        if existing.data:
+        # Create subscription (no-op when it already exists)
+        if not await repo.subscribe(current_user["user_id"], topic_id):
             raise HTTPException(status_code=400, detail="Already subscribed to this topic")
         
-        # Create subscription
-        supabase.table("subscriptions").insert({
-            "user_id": current_user["user_id"],
-            "topic_id": topic_id
-        }).execute()
-        
+        await invalidate_profile(current_user["user_id"])
         return {"message": "Successfully subscribed", "topic": topic.get("name")}
     except HTTPException:
         raise
@@ -62,10 +57,11 @@ async def unsubscribe_from_topic(
     current_user: dict = Depends(get_current_user),
 ):
     """Unsubscribe from a topic"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
-        supabase.table("subscriptions").delete().eq("user_id", current_user["user_id"]).eq("topic_id", topic_id).execute()
+        await repo.unsubscribe(current_user["user_id"], topic_id)
+        await invalidate_profile(current_user["user_id"])
         return {"message": "Successfully unsubscribed"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to unsubscribe: {str(e)}")
@@ -74,21 +70,11 @@ async def unsubscribe_from_topic(
 @router.get("/subscriptions/", response_model=List[TopicResponse])
 async def get_user_subscriptions(current_user: dict = Depends(get_current_user)):
     """Get user's topic subscriptions"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
-        # Get user's subscriptions
-        subscriptions = supabase.table("subscriptions").select("topic_id").eq("user_id", current_user["user_id"]).execute()
-        
-        if not subscriptions.data:
-            return []
-        
-        topic_ids = [sub["topic_id"] for sub in subscriptions.data]
-        
-        # Get topics
-        if topic_ids:
-            topics = supabase.table("topics").select("*").in_("id", topic_ids).execute()
-            return [TopicResponse.model_validate(t) for t in topics.data] if topics.data else []
-        return []
+        # Subscribed topics, joined in one query
+        topics = await repo.user_topics(current_user["user_id"])
+        return [TopicResponse.model_validate(t) for t in topics]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch subscriptions: {str(e)}")
@@ -1,36 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException
 
-from app.db.supabase import get_supabase
+from app.repositories import get_repository
 from app.schemas.user import UserResponse, UserUpdate
+from app.core.profiles import get_profile, invalidate_profile
 from app.core.security import get_current_user
 
 router = APIRouter()
 
 
+async def _profile_response(user_id: str) -> UserResponse:
+    # User plus subscribed topic IDs, from the per-user cache or one query
+    profile = await get_profile(user_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="User not found")
+    return UserResponse.model_validate(profile)
+
+
 @router.get("/me/", response_model=UserResponse)
 async def get_me(current_user: dict = Depends(get_current_user)):
     """Get current user info"""
-    supabase = get_supabase()
-    
     try:
-        user_result = supabase.table("users").select("*").eq("id", current_user["user_id"]).execute()
-        if not user_result.data or len(user_result.data) == 0:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        user = user_result.data[0]
-        
-        # Get subscribed topics
-        subscriptions = supabase.table("subscriptions").select("topic_id").eq("user_id", user["id"]).execute()
-        subscribed_topic_ids = [str(sub["topic_id"]) for sub in subscriptions.data] if subscriptions.data else []
-        
-        return UserResponse(
-            id=user["id"],
-            email=user["email"],
-            name=user["name"],
-            profile_type=user.get("profile_type"),
-            subscribed_topics=subscribed_topic_ids,
-            created_at=user.get("created_at"),
-        )
+        return await _profile_response(current_user["user_id"])
     except HTTPException:
         raise
     except Exception as e:
@@ -43,7 +33,7 @@ async def update_profile(
     current_user: dict = Depends(get_current_user),
 ):
     """Update user profile"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
         user_id = current_user["user_id"]
@@ -59,24 +49,12 @@ async def update_profile(
             raise HTTPException(status_code=400, detail="No fields to update")
         
         # Update user
-        result = supabase.table("users").update(update_data).eq("id", user_id).execute()
-        if not result.data:
+        user = await repo.update_user(user_id, update_data)
+        if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        user = result.data[0]
-        
-        # Get subscribed topics
-        subscriptions = supabase.table("subscriptions").select("topic_id").eq("user_id", user["id"]).execute()
-        subscribed_topic_ids = [str(sub["topic_id"]) for sub in subscriptions.data] if subscriptions.data else []
-        
-        return UserResponse(
-            id=user["id"],
-            email=user["email"],
-            name=user["name"],
-            profile_type=user.get("profile_type"),
-            subscribed_topics=subscribed_topic_ids,
-            created_at=user.get("created_at"),
-        )
+        await invalidate_profile(user_id)
+        return await _profile_response(user_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -86,11 +64,12 @@ async def update_profile(
 @router.delete("/")
 async def delete_account(current_user: dict = Depends(get_current_user)):
     """Delete user account"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
         user_id = current_user["user_id"]
-        supabase.table("users").delete().eq("id", user_id).execute()
+        await repo.delete_user(user_id)
+        await invalidate_profile(user_id)
         return {"message": "Account deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete account: {str(e)}")
@@ -102,44 +81,22 @@ async def subscribe_to_topic(
     current_user: dict = Depends(get_current_user),
 ):
     """Subscribe user to a topic"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
         user_id = current_user["user_id"]
         
         # Check if topic exists
-        topic_result = supabase.table("topics").select("id").eq("id", topic_id).execute()
-        if not topic_result.data:
+        if not await repo.get_topic(topic_id):
             raise HTTPException(status_code=404, detail="Topic not found")
         
-        # Check if already subscribed
-        existing = supabase.table("subscriptions").select("id").eq("user_id", user_id).eq("topic_id", topic_id).execute()
-        if existing.data:
+        # Create subscription (no-op when it already exists)
+        if not await repo.subscribe(user_id, topic_id):
             raise HTTPException(status_code=400, detail="Already subscribed to this topic")
         
-        # Create subscription
-        supabase.table("subscriptions").insert({
-            "user_id": user_id,
-            "topic_id": topic_id
-        }).execute()
-        
         # Return updated user
-        user_result = supabase.table("users").select("*").eq("id", user_id).execute()
-        user = user_result.data[0] if user_result.data else None
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        subscriptions = supabase.table("subscriptions").select("topic_id").eq("user_id", user["id"]).execute()
-        subscribed_topic_ids = [str(sub["topic_id"]) for sub in subscriptions.data] if subscriptions.data else []
-        
-        return UserResponse(
-            id=user["id"],
-            email=user["email"],
-            name=user["name"],
-            profile_type=user.get("profile_type"),
-            subscribed_topics=subscribed_topic_ids,
-            created_at=user.get("created_at"),
-        )
+        await invalidate_profile(user_id)
+        return await _profile_response(user_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -152,31 +109,17 @@ async def unsubscribe_from_topic(
     current_user: dict = Depends(get_current_user),
 ):
     """Unsubscribe user from a topic"""
-    supabase = get_supabase()
+    repo = get_repository()
     
     try:
         user_id = current_user["user_id"]
         
         # Find and delete subscription
-        supabase.table("subscriptions").delete().eq("user_id", user_id).eq("topic_id", topic_id).execute()
+        await repo.unsubscribe(user_id, topic_id)
         
         # Return updated user
-        user_result = supabase.table("users").select("*").eq("id", user_id).execute()
-        user = user_result.data[0] if user_result.data else None
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        subscriptions = supabase.table("subscriptions").select("topic_id").eq("user_id", user["id"]).execute()
-        subscribed_topic_ids = [str(sub["topic_id"]) for sub in subscriptions.data] if subscriptions.data else []
-        
-        return UserResponse(
-            id=user["id"],
-            email=user["email"],
-            name=user["name"],
-            profile_type=user.get("profile_type"),
-            subscribed_topics=subscribed_topic_ids,
-            created_at=user.get("created_at"),
-        )
+        await invalidate_profile(user_id)
+        return await _profile_response(user_id)
     except HTTPException:
         raise
     except Exception as e:
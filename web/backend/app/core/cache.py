@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Table named in a NOTIFY payload "<table>" -> cache namespaces to drop
+INVALIDATES = {
+    "articles": ("articles", "newsletter"),
+    "article_variants": ("articles",),
+    "topics": ("topics",),
+}
+
+# Payload "<table>:<key>" from row-level triggers -> namespaces of that row only.
+# A content edit on a published article drops its detail entries; lists and the
+# digest pick it up when their entries expire.
+INVALIDATES_ROW = {
+    "articles": ("articles:detail:{key}",),
+    "users": ("users:{key}",),
+    "subscriptions": ("users:{key}",),
+}
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class MemoryBackend:
+    """Per-process LRU with a TTL per entry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, entry = item
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    async def set(self, key: str, entry: CachedResponse, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def invalidate(self, namespace: str) -> None:
+        prefix = f"{namespace}:"
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend:
+    """Shared cache for several workers/replicas (needs the optional redis package)"""
+
+    PREFIX = "scinewsai:cache:"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self._redis.get(self.PREFIX + key)
+        if raw is None:
+            return None
+        etag, _, body = raw.partition(b"\n")
+        return CachedResponse(body=body, etag=etag.decode())
+
+    async def set(self, key: str, entry: CachedResponse, ttl: int) -> None:
+        await self._redis.set(self.PREFIX + key, entry.etag.encode() + b"\n" + entry.body, ex=ttl)
+
+    async def invalidate(self, namespace: str) -> None:
+        keys = [key async for key in self._redis.scan_iter(match=f"{self.PREFIX}{namespace}:*")]
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self._redis.scan_iter(match=f"{self.PREFIX}*")]
+        if keys:
+            await self._redis.delete(*keys)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ResponseCache:
+    """
+    Caches serialized JSON responses for read-heavy endpoints. Keys are
+    "<namespace>:<rest>"; a whole namespace is dropped when Postgres notifies
+    that the underlying table changed (see listen_for_invalidations).
+    """
+
+    def __init__(self):
+        self.ttl = settings.CACHE_TTL_SECONDS
+        self.enabled = settings.CACHE_ENABLED
+        self.backend = MemoryBackend(settings.CACHE_MAX_ENTRIES)
+        if settings.REDIS_URL:
+            try:
+                self.backend = RedisBackend(settings.REDIS_URL)
+            except ImportError:
+                logger.warning("REDIS_URL is set but the redis package is not installed; using the in-process cache")
+        self.hits = 0
+        self.misses = 0
+
+    async def _get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+
+    async def _set(self, key: str, entry: CachedResponse, ttl: int) -> None:
+        try:
+            await self.backend.set(key, entry, ttl)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+    async def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            try:
+                await self.backend.invalidate(namespace)
+            except Exception as e:
+                logger.warning(f"Cache invalidation failed for {namespace}: {e}")
+
+    async def clear(self) -> None:
+        try:
+            await self.backend.clear()
+        except Exception as e:
+            logger.warning(f"Cache clear failed: {e}")
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        """Cached value stored with set_json, or None"""
+        entry = await self._get(key) if self.enabled else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(entry.body)
+
+    async def set_json(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        if self.enabled:
+            body = json.dumps(jsonable_encoder(value), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            await self._set(key, CachedResponse(body=body, etag=make_etag(body)), ttl or self.ttl)
+
+    async def respond(
+        self,
+        request: Request,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+    ) -> Response:
+        """
+        Returns the cached body for key, or awaits loader() and caches its JSON.
+        Either way the response carries a strong ETag, and a matching
+        If-None-Match gets an empty 304.
+        """
+        entry = await self._get(key) if self.enabled else None
+        if entry is None:
+            self.misses += 1
+            data = await loader()
+            body = json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            entry = CachedResponse(body=body, etag=make_etag(body))
+            if self.enabled:
+                await self._set(key, entry, ttl or self.ttl)
+        else:
+            self.hits += 1
+
+        # no-cache: browsers keep the body but revalidate, so invalidations show up at once
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def _asyncpg_dsn(url: str) -> str:
+    # asyncpg wants plain postgresql://, not SQLAlchemy's postgresql+driver://
+    scheme, sep, rest = url.partition("://")
+    return scheme.split("+")[0] + sep + rest
+
+
+async def listen_for_invalidations(retry_delay: float = 30.0) -> None:
+    """
+    Holds a LISTEN connection on CACHE_INVALIDATION_CHANNEL (fed by the triggers
+    in migrations.sql) and drops the namespaces of each table that changed. Runs until
+    cancelled; while disconnected, entries only expire through their TTL, and
+    the whole cache is cleared on reconnect since notifications may have been missed.
+    """
+    import asyncpg
+
+    channel = settings.CACHE_INVALIDATION_CHANNEL
+    # The event loop only keeps weak references to tasks: hold them until they finish
+    pending = set()
+
+    def on_done(task: asyncio.Task):
+        pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Cache invalidation failed: {task.exception()}")
+
+    def on_notify(connection, pid, channel, payload):
+        table, _, key = payload.partition(":")
+        if key:
+            namespaces = [namespace.format(key=key) for namespace in INVALIDATES_ROW.get(table, ())]
+        else:
+            namespaces = list(INVALIDATES.get(table, ()))
+        if namespaces:
+            task = asyncio.create_task(response_cache.invalidate(*namespaces))
+            pending.add(task)
+            task.add_done_callback(on_done)
+
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(_asyncpg_dsn(settings.DATABASE_URL))
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _: closed.set())
+            await conn.add_listener(channel, on_notify)
+            await response_cache.clear()
+            logger.info(f"Listening for cache invalidations on '{channel}'")
+            await closed.wait()
+            logger.warning("Cache invalidation connection closed")
+        except asyncio.CancelledError:
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+            raise
+        except Exception as e:
+            logger.warning(f"Cannot LISTEN for cache invalidations ({e}); relying on TTL")
+        await asyncio.sleep(retry_delay)
@@ -0,0 +1,27 @@
+from functools import partial
+from typing import Callable, Optional, TypeVar
+
+import anyio
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Created on first use: a CapacityLimiter has to be built inside the running event loop
+_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def get_limiter() -> anyio.CapacityLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(settings.DB_THREADPOOL_SIZE)
+    return _limiter
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Runs a blocking call (Supabase HTTP request, password hashing) in a worker
+    thread so the event loop keeps serving other requests. At most
+    DB_THREADPOOL_SIZE such calls run at once; the rest wait without blocking.
+    """
+    return await anyio.to_thread.run_sync(partial(func, *args, **kwargs), limiter=get_limiter())
@@ -17,7 +17,17 @@ class Settings(BaseSettings):
     # Supabase Configuration
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
-    USE_SUPABASE: bool = False
+    # Direct SQL over DATABASE_URL is opt-in (USE_SUPABASE=false) and needs table privileges there
+    USE_SUPABASE: bool = True
+    # Worker threads for blocking database calls and password hashing
+    DB_THREADPOOL_SIZE: int = 20
+    
+    # Response cache (REDIS_URL shares it across workers; needs the redis package)
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 512
+    CACHE_INVALIDATION_CHANNEL: str = "cache_invalidation"
+    REDIS_URL: str = ""
     
     # Security
     SECRET_KEY: str = "your-super-secret-key-change-in-production"
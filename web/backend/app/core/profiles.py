@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache import response_cache
+from app.repositories import get_repository
+
+
+def _namespace(user_id: str) -> str:
+    return f"users:{user_id}"
+
+
+async def cache_profile(profile: dict) -> dict:
+    """Stores a user + subscribed_topics dict (password_hash dropped) and returns it JSON-ready"""
+    profile = jsonable_encoder({k: v for k, v in profile.items() if k != "password_hash"})
+    await response_cache.set_json(f"{_namespace(profile['id'])}:profile", profile)
+    return profile
+
+
+async def get_profile(user_id: str) -> Optional[dict]:
+    """
+    User with subscribed topic IDs. Served from the per-user cache; a miss costs
+    one repository query. Dropped by invalidate_profile and, across workers, by
+    the users/subscriptions NOTIFY triggers.
+    """
+    cached = await response_cache.get_json(f"{_namespace(user_id)}:profile")
+    if cached is not None:
+        return cached
+    profile = await get_repository().get_profile(user_id)
+    return await cache_profile(profile) if profile else None
+
+
+async def invalidate_profile(user_id: str) -> None:
+    await response_cache.invalidate(_namespace(user_id))
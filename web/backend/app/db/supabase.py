@@ -1,4 +1,6 @@
 from supabase import create_client, Client
+from postgrest import APIResponse
+from app.core.concurrency import run_blocking
 from app.core.config import settings
 
 # Initialize Supabase client
@@ -10,3 +12,8 @@ def get_supabase() -> Client:
     if supabase is None:
         supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
     return supabase
+
+
+async def execute(query) -> APIResponse:
+    """Run a Supabase query builder's blocking .execute() off the event loop"""
+    return await run_blocking(query.execute)
@@ -1,8 +1,10 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.api import auth, articles, topics, users, newsletter, likes
+from app.core.cache import listen_for_invalidations, response_cache
 from app.core.config import settings
 from app.db.database import engine, Base
 
@@ -12,9 +14,16 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
     print("Starting SciNewsAI API...")
+    invalidation_listener = asyncio.create_task(listen_for_invalidations()) if settings.CACHE_ENABLED else None
     yield
     # Shutdown
     print("Shutting down SciNewsAI API...")
+    if invalidation_listener:
+        invalidation_listener.cancel()
+        try:
+            await invalidation_listener
+        except asyncio.CancelledError:
+            pass
 
 
 app = FastAPI(
@@ -58,5 +67,5 @@ async def health_check():
     return {
         "status": "healthy",
         "database": "connected",
-        "cache": "connected"
+        "cache": response_cache.stats(),
     }
@@ -2,3 +2,5 @@ from app.models.user import User
 from app.models.article import Article
 from app.models.topic import Topic
 from app.models.subscription import Subscription
+from app.models.article_variant import ArticleVariant
+from app.models.like import Like
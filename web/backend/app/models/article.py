@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, Date, DateTime, ARRAY
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, Date, DateTime, Integer, ARRAY
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from datetime import datetime
 import uuid
 
@@ -21,3 +21,5 @@ class Article(Base):
     processing_status = Column(String(50), default="pending")
     simplified_text = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    search_vector = Column(TSVECTOR, nullable=True)  # maintained by trigger (migrations.sql)
+    like_count = Column(Integer, nullable=False, default=0)  # maintained by trigger (migrations.sql)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.db.database import Base
+
+
+class ArticleVariant(Base):
+    __tablename__ = "article_variants"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(String, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, index=True)
+    profile_type = Column(String(20), nullable=False)
+    simplified_text = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    # Relationships
+    article = relationship("Article", backref="variants")
+
+    # Uma versão por perfil de leitor
+    __table_args__ = (UniqueConstraint('article_id', 'profile_type', name='uq_article_variant_profile'),)
@@ -0,0 +1,14 @@
+from functools import lru_cache
+
+from app.core.config import settings
+from app.repositories.base import Cursor, Repository
+
+
+@lru_cache
+def get_repository() -> Repository:
+    """Supabase REST by default; direct SQL over DATABASE_URL when USE_SUPABASE is false"""
+    if settings.USE_SUPABASE:
+        from app.repositories.supabase import SupabaseRepository
+        return SupabaseRepository()
+    from app.repositories.sql import SQLRepository
+    return SQLRepository()
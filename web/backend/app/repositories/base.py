@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# (publication_date as ISO string or None, article id) of the last row already returned
+Cursor = Tuple[Optional[str], str]
+
+
+class Repository(ABC):
+    """
+    Data access used by the routers. Rows are plain dicts shaped like the
+    Supabase REST responses, so routers validate them with the same schemas
+    whichever implementation is active (see get_repository).
+    """
+
+    # Articles
+
+    @abstractmethod
+    async def list_articles(
+        self,
+        limit: int,
+        after: Optional[Cursor] = None,
+        offset: int = 0,
+        search: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Tuple[List[dict], Optional[int]]:
+        """Translated article summaries in (publication_date DESC NULLS FIRST, id DESC) order, plus the total if asked"""
+
+    @abstractmethod
+    async def search_articles(self, query: str, limit: int, offset: int) -> List[dict]:
+        """Ranked full-text matches with highlighted snippets (search_articles SQL function)"""
+
+    @abstractmethod
+    async def get_article(self, article_id: str, audience: Optional[str] = None) -> Optional[dict]:
+        """Article detail; simplified_text is the audience's variant when one exists"""
+
+    @abstractmethod
+    async def get_article_fields(self, article_id: str, columns: List[str]) -> Optional[dict]:
+        """Just the given columns of one article"""
+
+    @abstractmethod
+    async def latest_articles(self, limit: int) -> List[dict]:
+        """Most recent completed article summaries"""
+
+    @abstractmethod
+    async def digest_articles(self, since: datetime, limit: int) -> List[dict]:
+        """Completed article summaries created since the given time, newest first"""
+
+    @abstractmethod
+    async def article_subscribers(self, article_id: str) -> Optional[Tuple[dict, List[dict]]]:
+        """The article (id, title) and the users subscribed to a topic among its keywords"""
+
+    # Topics
+
+    @abstractmethod
+    async def list_topics(self) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def get_topic(self, topic_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def user_topics(self, user_id: str) -> List[dict]:
+        """Topics the user is subscribed to"""
+
+    @abstractmethod
+    async def subscribe(self, user_id: str, topic_id: str) -> bool:
+        """Adds the subscription in one statement; False if it already existed"""
+
+    @abstractmethod
+    async def unsubscribe(self, user_id: str, topic_id: str) -> None:
+        ...
+
+    # Users
+
+    @abstractmethod
+    async def get_user(self, user_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def get_profile(self, user_id: str) -> Optional[dict]:
+        """User (without password_hash) plus subscribed_topics, a list of topic ID strings, in one query"""
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
+        """Like get_profile but by email and including password_hash, for login"""
+
+    @abstractmethod
+    async def create_user(self, user: dict) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def update_user(self, user_id: str, updates: dict) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def delete_user(self, user_id: str) -> None:
+        ...
+
+    # Likes
+
+    @abstractmethod
+    async def article_exists(self, article_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def like(self, like: dict) -> Optional[dict]:
+        """Inserts the like in one statement (ON CONFLICT DO NOTHING); None if it already existed or the article does not"""
+
+    @abstractmethod
+    async def unlike(self, user_id: str, article_id: str) -> bool:
+        """Deletes the like in one statement; False if there was none"""
+
+    @abstractmethod
+    async def like_statuses(self, user_id: str, article_ids: List[str]) -> List[dict]:
+        """{"article_id", "like_count", "is_liked"} for each existing article among article_ids, in one query"""
+
+    @abstractmethod
+    async def count_likes(self, article_id: str) -> int:
+        """The articles.like_count counter kept by trigger; 0 if the article does not exist"""
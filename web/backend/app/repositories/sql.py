@@ -0,0 +1,318 @@
+import uuid
+from datetime import date, datetime
+from functools import wraps
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Text, and_, any_, cast, delete, exists, func, insert, literal, or_, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+
+from app.core.concurrency import run_blocking
+from app.db.database import SessionLocal
+from app.models.article import Article
+from app.models.article_variant import ArticleVariant
+from app.models.like import Like
+from app.models.subscription import Subscription
+from app.models.topic import Topic
+from app.models.user import ProfileType, User
+from app.repositories.base import Cursor, Repository
+from app.schemas.article import ARTICLE_DETAIL_COLUMNS, ARTICLE_SUMMARY_COLUMNS
+
+SUMMARY_COLUMNS = [Article.__table__.c[name] for name in ARTICLE_SUMMARY_COLUMNS.split(",")]
+DETAIL_COLUMNS = [Article.__table__.c[name] for name in ARTICLE_DETAIL_COLUMNS.split(",")]
+USER_COLUMNS = [c for c in User.__table__.c if c.name != "password_hash"]
+
+
+def offloaded(method):
+    """Runs a blocking repository method in the bounded threadpool and returns a coroutine"""
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await run_blocking(method, self, *args, **kwargs)
+    return wrapper
+
+
+def _rows(result) -> List[dict]:
+    return [dict(row) for row in result.mappings()]
+
+
+def _first(result) -> Optional[dict]:
+    row = result.mappings().first()
+    return dict(row) if row else None
+
+
+def _user(row: Optional[dict]) -> Optional[dict]:
+    # Same shape as the REST rows: string ids (they go into JWTs) and the
+    # profile_type values, where the users.profile_type enum stores member names
+    if row:
+        row["id"] = str(row["id"])
+        if "subscribed_topics" in row:
+            row["subscribed_topics"] = row["subscribed_topics"] or []
+        if isinstance(row.get("profile_type"), ProfileType):
+            row["profile_type"] = row["profile_type"].value
+    return row
+
+
+def _user_values(values: dict) -> dict:
+    values = dict(values)
+    if "id" in values:
+        values["id"] = _uuid(values["id"])
+    if values.get("profile_type") is not None:
+        values["profile_type"] = ProfileType(getattr(values["profile_type"], "value", values["profile_type"]))
+    return values
+
+
+def _uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def _profile_query(columns):
+    """User columns plus the subscribed topic IDs, aggregated over a LEFT JOIN"""
+    subscribed_topics = func.array_agg(cast(Subscription.topic_id, Text)).filter(Subscription.topic_id.isnot(None))
+    return (
+        select(*columns, subscribed_topics.label("subscribed_topics"))
+        .outerjoin(Subscription, Subscription.user_id == User.id)
+        .group_by(User.id)
+    )
+
+
+class SQLRepository(Repository):
+    """
+    Queries Postgres directly through the pooled SQLAlchemy engine
+    (app.db.database), one session per call. Lookups that take several REST
+    calls on Supabase (variant overlay, subscribers, subscribed topics) are a
+    single joined statement here.
+    """
+
+    # Articles
+
+    @offloaded
+    def list_articles(self, limit, after: Optional[Cursor] = None, offset=0, search=None, include_total=False):
+        conditions = [Article.processing_status == "translated"]
+        if search:
+            conditions.append(or_(
+                Article.search_vector.op("@@")(func.websearch_to_tsquery("english", search)),
+                Article.search_vector.op("@@")(func.websearch_to_tsquery("portuguese", search)),
+            ))
+        if after:
+            publication_date, article_id = after
+            if publication_date is None:
+                conditions.append(or_(
+                    and_(Article.publication_date.is_(None), Article.id < article_id),
+                    Article.publication_date.isnot(None),
+                ))
+            else:
+                publication_date = date.fromisoformat(publication_date)
+                conditions.append(or_(
+                    Article.publication_date < publication_date,
+                    and_(Article.publication_date == publication_date, Article.id < article_id),
+                ))
+
+        query = (
+            select(*SUMMARY_COLUMNS)
+            .where(*conditions)
+            .order_by(Article.publication_date.desc().nulls_first(), Article.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        with SessionLocal() as session:
+            articles = _rows(session.execute(query))
+            total = session.scalar(select(func.count()).select_from(Article).where(*conditions)) if include_total else None
+        return articles, total
+
+    @offloaded
+    def search_articles(self, query, limit, offset):
+        with SessionLocal() as session:
+            return _rows(session.execute(
+                text("SELECT * FROM search_articles(:query, :max_results, :result_offset)"),
+                {"query": query, "max_results": limit, "result_offset": offset},
+            ))
+
+    @offloaded
+    def get_article(self, article_id, audience=None):
+        if not audience:
+            query = select(*DETAIL_COLUMNS).where(Article.id == article_id)
+        else:
+            # The variant, when generated, replaces simplified_text in the same statement
+            query = (
+                select(
+                    *[c for c in DETAIL_COLUMNS if c.name != "simplified_text"],
+                    func.coalesce(ArticleVariant.simplified_text, Article.simplified_text).label("simplified_text"),
+                    ArticleVariant.profile_type.label("audience"),
+                )
+                .outerjoin(ArticleVariant, and_(ArticleVariant.article_id == Article.id, ArticleVariant.profile_type == audience))
+                .where(Article.id == article_id)
+            )
+        with SessionLocal() as session:
+            return _first(session.execute(query))
+
+    @offloaded
+    def get_article_fields(self, article_id, columns):
+        query = select(*[Article.__table__.c[name] for name in columns]).where(Article.id == article_id)
+        with SessionLocal() as session:
+            return _first(session.execute(query))
+
+    @offloaded
+    def latest_articles(self, limit):
+        query = (
+            select(*SUMMARY_COLUMNS)
+            .where(Article.processing_status == "completed")
+            .order_by(Article.publication_date.desc())
+            .limit(limit)
+        )
+        with SessionLocal() as session:
+            return _rows(session.execute(query))
+
+    @offloaded
+    def digest_articles(self, since: datetime, limit):
+        query = (
+            select(*SUMMARY_COLUMNS)
+            .where(Article.processing_status == "completed", Article.created_at >= since)
+            .order_by(Article.created_at.desc())
+            .limit(limit)
+        )
+        with SessionLocal() as session:
+            return _rows(session.execute(query))
+
+    @offloaded
+    def article_subscribers(self, article_id) -> Optional[Tuple[dict, List[dict]]]:
+        subscribers = (
+            select(User.id, User.email, User.name, User.profile_type)
+            .distinct()
+            .select_from(Article)
+            .join(Topic, Topic.slug == func.any(Article.keywords))
+            .join(Subscription, Subscription.topic_id == Topic.id)
+            .join(User, User.id == Subscription.user_id)
+            .where(Article.id == article_id)
+        )
+        with SessionLocal() as session:
+            article = _first(session.execute(select(Article.id, Article.title).where(Article.id == article_id)))
+            if article is None:
+                return None
+            return article, [_user(row) for row in _rows(session.execute(subscribers))]
+
+    # Topics
+
+    @offloaded
+    def list_topics(self):
+        with SessionLocal() as session:
+            return _rows(session.execute(select(Topic.__table__).order_by(Topic.name)))
+
+    @offloaded
+    def get_topic(self, topic_id):
+        with SessionLocal() as session:
+            return _first(session.execute(select(Topic.__table__).where(Topic.id == _uuid(topic_id))))
+
+    @offloaded
+    def user_topics(self, user_id):
+        query = (
+            select(Topic.__table__)
+            .join(Subscription, Subscription.topic_id == Topic.id)
+            .where(Subscription.user_id == _uuid(user_id))
+        )
+        with SessionLocal() as session:
+            return _rows(session.execute(query))
+
+    @offloaded
+    def subscribe(self, user_id, topic_id):
+        query = (
+            pg_insert(Subscription)
+            .values(user_id=_uuid(user_id), topic_id=_uuid(topic_id))
+            .on_conflict_do_nothing(index_elements=["user_id", "topic_id"])
+            .returning(Subscription.id)
+        )
+        with SessionLocal() as session:
+            created = session.scalar(query) is not None
+            session.commit()
+        return created
+
+    @offloaded
+    def unsubscribe(self, user_id, topic_id):
+        with SessionLocal() as session:
+            session.execute(delete(Subscription).where(Subscription.user_id == _uuid(user_id), Subscription.topic_id == _uuid(topic_id)))
+            session.commit()
+
+    # Users
+
+    @offloaded
+    def get_user(self, user_id):
+        with SessionLocal() as session:
+            return _user(_first(session.execute(select(*USER_COLUMNS).where(User.id == _uuid(user_id)))))
+
+    @offloaded
+    def get_profile(self, user_id):
+        with SessionLocal() as session:
+            return _user(_first(session.execute(_profile_query(USER_COLUMNS).where(User.id == _uuid(user_id)))))
+
+    @offloaded
+    def get_user_by_email(self, email):
+        with SessionLocal() as session:
+            return _user(_first(session.execute(_profile_query(list(User.__table__.c)).where(User.email == email))))
+
+    @offloaded
+    def create_user(self, user):
+        with SessionLocal() as session:
+            row = _first(session.execute(insert(User).values(**_user_values(user)).returning(*USER_COLUMNS)))
+            session.commit()
+        return _user(row)
+
+    @offloaded
+    def update_user(self, user_id, updates):
+        query = update(User).where(User.id == _uuid(user_id)).values(**_user_values(updates)).returning(*USER_COLUMNS)
+        with SessionLocal() as session:
+            row = _first(session.execute(query))
+            session.commit()
+        return _user(row)
+
+    @offloaded
+    def delete_user(self, user_id):
+        with SessionLocal() as session:
+            session.execute(delete(User).where(User.id == _uuid(user_id)))
+            session.commit()
+
+    # Likes
+
+    @offloaded
+    def article_exists(self, article_id):
+        with SessionLocal() as session:
+            return session.scalar(select(Article.id).where(Article.id == article_id)) is not None
+
+    @offloaded
+    def like(self, like):
+        query = (
+            pg_insert(Like)
+            .values(**{**like, "user_id": _uuid(like["user_id"])})
+            .on_conflict_do_nothing(index_elements=["user_id", "article_id"])
+            .returning(Like.__table__)
+        )
+        with SessionLocal() as session:
+            try:
+                row = _first(session.execute(query))
+            except IntegrityError as e:
+                if getattr(e.orig, "pgcode", None) == "23503":  # foreign_key_violation: no such article
+                    return None
+                raise
+            session.commit()
+        return row
+
+    @offloaded
+    def unlike(self, user_id, article_id):
+        query = delete(Like).where(Like.user_id == _uuid(user_id), Like.article_id == article_id).returning(Like.id)
+        with SessionLocal() as session:
+            deleted = session.scalar(query) is not None
+            session.commit()
+        return deleted
+
+    @offloaded
+    def like_statuses(self, user_id, article_ids):
+        is_liked = exists().where(Like.article_id == Article.id, Like.user_id == _uuid(user_id))
+        query = (
+            select(Article.id.label("article_id"), Article.like_count, is_liked.label("is_liked"))
+            .where(Article.id == any_(literal(list(article_ids), ARRAY(Text))))
+        )
+        with SessionLocal() as session:
+            return _rows(session.execute(query))
+
+    @offloaded
+    def count_likes(self, article_id):
+        with SessionLocal() as session:
+            return session.scalar(select(Article.like_count).where(Article.id == article_id)) or 0
@@ -0,0 +1,206 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+from app.db.supabase import execute, get_supabase
+from app.repositories.base import Cursor, Repository
+from app.schemas.article import ARTICLE_DETAIL_COLUMNS, ARTICLE_SUMMARY_COLUMNS
+
+PROFILE_COLUMNS = "id,email,name,profile_type,created_at"
+
+
+def _quote(value: str) -> str:
+    """Double-quotes a value for use inside a PostgREST or=(...) filter"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _after_cursor(publication_date: Optional[str], article_id: str) -> str:
+    """
+    PostgREST filter for the rows that follow the cursor. Postgres sorts NULLs
+    first in DESC order, so undated articles come before every dated one.
+    """
+    article_id = _quote(article_id)
+    if publication_date is None:
+        return f"and(publication_date.is.null,id.lt.{article_id}),publication_date.not.is.null"
+    return f"publication_date.lt.{publication_date},and(publication_date.eq.{publication_date},id.lt.{article_id})"
+
+
+def _first(result) -> Optional[dict]:
+    return result.data[0] if result.data else None
+
+
+def _profile(user: Optional[dict]) -> Optional[dict]:
+    """Flattens the embedded subscriptions(topic_id) into subscribed_topics"""
+    if user is not None:
+        user["subscribed_topics"] = [str(sub["topic_id"]) for sub in user.pop("subscriptions", None) or []]
+    return user
+
+
+class SupabaseRepository(Repository):
+    """Queries through the Supabase REST API (PostgREST)"""
+
+    @property
+    def client(self):
+        return get_supabase()
+
+    # Articles
+
+    async def list_articles(self, limit, after=None, offset=0, search=None, include_total=False):
+        # "estimated" is exact for small tables and the planner's guess for large ones, in the same request
+        count = "estimated" if include_total else None
+        query = self.client.table("articles").select(ARTICLE_SUMMARY_COLUMNS, count=count).eq("processing_status", "translated")
+
+        filters = []
+        if search:
+            # Same tsvector/GIN index as /search/, but keeps the date order and cursor
+            filters.append(f"search_vector.wfts(english).{_quote(search)},search_vector.wfts(portuguese).{_quote(search)}")
+        if after:
+            filters.append(_after_cursor(*after))
+        if len(filters) == 1:
+            query = query.or_(filters[0])
+        elif filters:
+            query = query.or_("and(" + ",".join(f"or({f})" for f in filters) + ")")
+
+        query = query.order("publication_date", desc=True, nullsfirst=True).order("id", desc=True)
+        query = query.range(offset, offset + limit - 1) if offset else query.limit(limit)
+        result = await execute(query)
+        return result.data or [], result.count if count else None
+
+    async def search_articles(self, query, limit, offset):
+        result = await execute(self.client.rpc("search_articles", {"query": query, "max_results": limit, "result_offset": offset}))
+        return result.data or []
+
+    async def get_article(self, article_id, audience=None):
+        if not audience:
+            return _first(await execute(self.client.table("articles").select(ARTICLE_DETAIL_COLUMNS).eq("id", article_id)))
+
+        # Embedded select: the variant comes back in the same request
+        result = await execute(
+            self.client.table("articles")
+            .select(f"{ARTICLE_DETAIL_COLUMNS},article_variants(simplified_text)")
+            .eq("id", article_id)
+            .eq("article_variants.profile_type", audience)
+        )
+        article = _first(result)
+        if article is None:
+            return None
+        variants = article.pop("article_variants", None) or []
+        if variants:
+            article.update(simplified_text=variants[0]["simplified_text"], audience=audience)
+        return article
+
+    async def get_article_fields(self, article_id, columns):
+        return _first(await execute(self.client.table("articles").select(",".join(columns)).eq("id", article_id)))
+
+    async def latest_articles(self, limit):
+        result = await execute(self.client.table("articles").select(ARTICLE_SUMMARY_COLUMNS).eq("processing_status", "completed").order("publication_date", desc=True).limit(limit))
+        return result.data or []
+
+    async def digest_articles(self, since: datetime, limit):
+        result = await execute(self.client.table("articles").select(ARTICLE_SUMMARY_COLUMNS).eq("processing_status", "completed").gte("created_at", since.isoformat()).order("created_at", desc=True).limit(limit))
+        return result.data or []
+
+    async def article_subscribers(self, article_id) -> Optional[Tuple[dict, List[dict]]]:
+        article = await self.get_article_fields(article_id, ["id", "title", "keywords"])
+        if article is None:
+            return None
+
+        # Topics matching the article keywords (by slug), then their subscribers
+        keywords = article.get("keywords") or []
+        if not keywords:
+            return article, []
+        topics = await execute(self.client.table("topics").select("id").in_("slug", keywords))
+        topic_ids = [t["id"] for t in topics.data or []]
+        if not topic_ids:
+            return article, []
+        subscriptions = await execute(self.client.table("subscriptions").select("user_id").in_("topic_id", topic_ids))
+        user_ids = list({sub["user_id"] for sub in subscriptions.data or []})
+        if not user_ids:
+            return article, []
+        users = await execute(self.client.table("users").select("id,email,name,profile_type").in_("id", user_ids))
+        return article, users.data or []
+
+    # Topics
+
+    async def list_topics(self):
+        result = await execute(self.client.table("topics").select("*").order("name"))
+        return result.data or []
+
+    async def get_topic(self, topic_id):
+        return _first(await execute(self.client.table("topics").select("*").eq("id", topic_id)))
+
+    async def user_topics(self, user_id):
+        result = await execute(self.client.table("subscriptions").select("topics(*)").eq("user_id", user_id))
+        return [row["topics"] for row in result.data or [] if row.get("topics")]
+
+    async def subscribe(self, user_id, topic_id):
+        # ON CONFLICT DO NOTHING: only a newly inserted row comes back
+        result = await execute(
+            self.client.table("subscriptions")
+            .upsert({"user_id": user_id, "topic_id": topic_id}, on_conflict="user_id,topic_id", ignore_duplicates=True)
+        )
+        return bool(result.data)
+
+    async def unsubscribe(self, user_id, topic_id):
+        await execute(self.client.table("subscriptions").delete().eq("user_id", user_id).eq("topic_id", topic_id))
+
+    # Users
+
+    async def get_user(self, user_id):
+        return _first(await execute(self.client.table("users").select("*").eq("id", user_id)))
+
+    async def get_profile(self, user_id):
+        result = await execute(self.client.table("users").select(f"{PROFILE_COLUMNS},subscriptions(topic_id)").eq("id", user_id))
+        return _profile(_first(result))
+
+    async def get_user_by_email(self, email):
+        return _profile(_first(await execute(self.client.table("users").select("*,subscriptions(topic_id)").eq("email", email))))
+
+    async def create_user(self, user):
+        return _first(await execute(self.client.table("users").insert(user)))
+
+    async def update_user(self, user_id, updates):
+        return _first(await execute(self.client.table("users").update(updates).eq("id", user_id)))
+
+    async def delete_user(self, user_id):
+        await execute(self.client.table("users").delete().eq("id", user_id))
+
+    # Likes
+
+    async def article_exists(self, article_id):
+        return bool((await execute(self.client.table("articles").select("id").eq("id", article_id))).data)
+
+    async def like(self, like):
+        try:
+            result = await execute(
+                self.client.table("likes")
+                .upsert(like, on_conflict="user_id,article_id", ignore_duplicates=True)
+            )
+        except APIError as e:
+            if e.code == "23503":  # foreign_key_violation: no such article
+                return None
+            raise
+        return _first(result)
+
+    async def unlike(self, user_id, article_id):
+        # DELETE ... RETURNING (PostgREST returns the deleted rows)
+        result = await execute(self.client.table("likes").delete().eq("user_id", user_id).eq("article_id", article_id))
+        return bool(result.data)
+
+    async def like_statuses(self, user_id, article_ids):
+        # id IN (...) (= ANY on the server), with the user's likes embedded in the same request
+        result = await execute(
+            self.client.table("articles")
+            .select("id,like_count,likes(id)")
+            .in_("id", article_ids)
+            .eq("likes.user_id", user_id)
+        )
+        return [
+            {"article_id": article["id"], "like_count": article["like_count"], "is_liked": bool(article.get("likes"))}
+            for article in result.data or []
+        ]
+
+    async def count_likes(self, article_id):
+        article = await self.get_article_fields(article_id, ["like_count"])
+        return article["like_count"] if article else 0
@@ -1,3 +1,3 @@
 from app.schemas.user import UserCreate, UserResponse, UserUpdate, TokenResponse
-from app.schemas.article import ArticleCreate, ArticleResponse, ArticleListResponse
+from app.schemas.article import ArticleCreate, ArticleSummary, ArticleResponse, ArticleListResponse, ArticleSearchResult
 from app.schemas.topic import TopicCreate, TopicResponse
@@ -13,7 +13,8 @@ class ArticleCreate(BaseModel):
     source_url: Optional[str] = None
 
 
-class ArticleResponse(BaseModel):
+class ArticleSummary(BaseModel):
+    """Article card for lists and digests (no simplified or full text)"""
     id: str
     title: str
     authors: List[str]
@@ -22,15 +23,42 @@ class ArticleResponse(BaseModel):
     keywords: List[str]
     source_url: Optional[str]
     processing_status: str
-    simplified_text: Optional[str]
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class ArticleResponse(ArticleSummary):
+    simplified_text: Optional[str]
+    audience: Optional[str] = None
+
+
+# Supabase select() projections, so full_text and search_vector never leave the database
+ARTICLE_SUMMARY_COLUMNS = ",".join(ArticleSummary.model_fields)
+ARTICLE_DETAIL_COLUMNS = ARTICLE_SUMMARY_COLUMNS + ",simplified_text"
+
+
+class ArticleListItem(ArticleSummary):
+    """Summary plus like fields, filled only when the list is requested with include_likes"""
+    like_count: Optional[int] = None
+    is_liked: Optional[bool] = None
+
+
 class ArticleListResponse(BaseModel):
-    articles: List[ArticleResponse]
-    total: int
+    articles: List[ArticleListItem]
+    total: Optional[int] = None
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+class ArticleSearchResult(BaseModel):
+    id: str
+    title: str
+    authors: List[str]
+    publication_date: Optional[date]
+    keywords: List[str]
+    source_url: Optional[str]
+    rank: float
+    headline: Optional[str] = None
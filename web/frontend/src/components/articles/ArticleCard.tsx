@@ -1,13 +1,16 @@
 import { Link } from 'react-router-dom';
-import { Article } from '@/types';
+import { Article, LikeStatus } from '@/types';
 import { Calendar, Users, ArrowRight } from 'lucide-react';
 import { format } from 'date-fns';
+import { LikeButton } from './LikeButton';
 
 interface ArticleCardProps {
   article: Article;
+  // Fetched with the page (include_likes); without it the card shows no like button
+  likeStatus?: LikeStatus;
 }
 
-export function ArticleCard({ article }: ArticleCardProps) {
+export function ArticleCard({ article, likeStatus }: ArticleCardProps) {
   return (
     <Link to={`/article/${article.id}`} className="block">
       <article className="scholarly-card p-6 h-full flex flex-col">
@@ -40,6 +43,12 @@ export function ArticleCard({ article }: ArticleCardProps) {
         <div className="flex items-center gap-2 mt-4 pt-4 border-t border-border text-accent font-medium text-sm">
           Leia a versão simplificada
           <ArrowRight className="h-4 w-4" />
+          {likeStatus && (
+            // Liking must not follow the card link
+            <div className="ml-auto" onClick={(e) => { e.preventDefault(); e.stopPropagation(); }}>
+              <LikeButton articleId={article.id} size="sm" variant="ghost" initialStatus={likeStatus} />
+            </div>
+          )}
         </div>
       </article>
     </Link>
@@ -3,14 +3,17 @@ import { Heart } from 'lucide-react';
 import { Button } from '@/components/ui/button';
 import { likesApi } from '@/lib/apiService';
 import { toast } from '@/hooks/use-toast';
+import { LikeStatus } from '@/types';
 
 interface LikeButtonProps {
   articleId: string;
   size?: 'sm' | 'md' | 'lg';
   variant?: 'default' | 'outline' | 'ghost';
+  // From a batch lookup (likesApi.getStatuses or include_likes); skips the per-article request
+  initialStatus?: LikeStatus;
 }
 
-export function LikeButton({ articleId, size = 'md', variant = 'outline' }: LikeButtonProps) {
+export function LikeButton({ articleId, size = 'md', variant = 'outline', initialStatus }: LikeButtonProps) {
   const [isLiked, setIsLiked] = useState(false);
   const [likeCount, setLikeCount] = useState(0);
   const [loading, setLoading] = useState(false);
@@ -18,8 +21,14 @@ export function LikeButton({ articleId, size = 'md', variant = 'outline' }: Like
 
   // Load initial like status
   useEffect(() => {
+    if (initialStatus) {
+      setIsLiked(initialStatus.is_liked);
+      setLikeCount(initialStatus.like_count);
+      setInitialLoading(false);
+      return;
+    }
     loadLikeStatus();
-  }, [articleId]);
+  }, [articleId, initialStatus?.like_count, initialStatus?.is_liked]);
 
   const loadLikeStatus = async () => {
     try {
@@ -1,21 +1,30 @@
 import api from './api';
-import { Article, Topic, User } from '@/types';
+import { Article, ArticleSearchResult, LikeStatus, Topic, User } from '@/types';
 
 export const articlesApi = {
-  // Get all articles with optional filters
+  // Get all articles with optional filters (pass next_cursor back as cursor for the following page)
   getAll: async (params?: {
+    cursor?: string;
     page?: number;
     page_size?: number;
     search?: string;
     topic?: string;
+    include_total?: boolean;
+    include_likes?: boolean;
   }) => {
     const response = await api.get('/api/articles/', { params });
     return response.data;
   },
 
-  // Get single article
-  getById: async (id: string) => {
-    const response = await api.get(`/api/articles/${id}/`);
+  // Full-text search, best match first (headline has <b>-highlighted snippets)
+  search: async (q: string, params?: { limit?: number; offset?: number }) => {
+    const response = await api.get('/api/articles/search/', { params: { q, ...params } });
+    return response.data as ArticleSearchResult[];
+  },
+
+  // Get single article (audience: version written for that profile_type, if generated)
+  getById: async (id: string, audience?: User['profile_type']) => {
+    const response = await api.get(`/api/articles/${id}/`, { params: audience ? { audience } : undefined });
     return response.data as Article;
   },
 };
@@ -144,6 +153,12 @@ export const likesApi = {
     return response.data;
   },
 
+  // Get like status for several articles (e.g. a list page) in one request
+  getStatuses: async (articleIds: string[]) => {
+    const response = await api.get('/api/likes/status/', { params: { ids: articleIds.join(',') } });
+    return response.data as LikeStatus[];
+  },
+
   // Get public like count (no authentication required)
   getCount: async (articleId: string) => {
     const response = await api.get(`/api/articles/${articleId}/likes/`);
@@ -5,12 +5,18 @@ import { SearchBar } from '@/components/search/SearchBar';
 import { TopicBadge } from '@/components/topics/TopicBadge';
 import { useAuth } from '@/contexts/AuthContext';
 import { articlesApi, topicsApi, usersApi } from '@/lib/apiService';
-import { Article, Topic } from '@/types';
+import { Article, LikeStatus, Topic } from '@/types';
 import { Button } from '@/components/ui/button';
 import { Link } from 'react-router-dom';
 import { BookOpen, Compass, Bell, Loader2 } from 'lucide-react';
 import { toast } from '@/hooks/use-toast';
 
+// Like count and status come with the page (include_likes), so the cards need no request of their own
+const likeStatusOf = (article: Article): LikeStatus | undefined =>
+  article.like_count == null
+    ? undefined
+    : { article_id: article.id, like_count: article.like_count, is_liked: !!article.is_liked };
+
 export default function Dashboard() {
   const { user, setUser } = useAuth();
   const [articles, setArticles] = useState<Article[]>([]);
@@ -29,7 +35,7 @@ export default function Dashboard() {
         setLoading(true);
         setError(null);
         const [articlesData, topicsData] = await Promise.all([
-          articlesApi.getAll({ page: 1, page_size: 50 }),
+          articlesApi.getAll({ page: 1, page_size: 50, include_likes: true }),
           topicsApi.getAll(),
         ]);
         
@@ -252,7 +258,7 @@ export default function Dashboard() {
           ) : filteredArticles.length > 0 ? (
             <div className="grid md:grid-cols-2 gap-6">
               {filteredArticles.map((article) => (
-                <ArticleCard key={article.id} article={article} />
+                <ArticleCard key={article.id} article={article} likeStatus={likeStatusOf(article)} />
               ))}
             </div>
           ) : (
@@ -10,7 +10,28 @@ export interface Article {
   original_pdf_path?: string;
   processing_status: 'pending' | 'processing' | 'completed' | 'failed';
   simplified_text?: string;
+  audience?: 'student' | 'educator' | 'enthusiast' | null;
   created_at: string;
+  // Only on list items requested with include_likes
+  like_count?: number | null;
+  is_liked?: boolean | null;
+}
+
+export interface LikeStatus {
+  article_id: string;
+  like_count: number;
+  is_liked: boolean;
+}
+
+export interface ArticleSearchResult {
+  id: string;
+  title: string;
+  authors: string[];
+  publication_date: string | null;
+  keywords: string[];
+  source_url: string | null;
+  rank: number;
+  headline: string | null;
 }
 
 export interface User {
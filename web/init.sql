@@ -1,4 +1,5 @@
 -- SciNewsAI Database Initialization
+-- Colunas, tabelas e funções adicionadas depois ficam em migrations.sql, que roda após este arquivo
 
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
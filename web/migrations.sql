@@ -0,0 +1,225 @@
+-- SciNewsAI Database Migrations
+-- Roda depois do init.sql e pode ser reaplicado a qualquer momento: cada comando é idempotente,
+-- então bancos criados com uma versão anterior do init.sql recebem as colunas, tabelas e triggers novos.
+--   psql "$DATABASE_URL" -f web/migrations.sql   (no Supabase: colar no SQL Editor)
+
+-- Retentativas do tradutor (ai_translator/src/db.py cria as mesmas colunas)
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS translation_attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS last_error TEXT;
+-- Mesmo nome do índice criado pelo tradutor, para não duplicá-lo
+CREATE INDEX IF NOT EXISTS ix_articles_next_attempt_at ON articles(next_attempt_at);
+
+-- Ordem da listagem (keyset em publication_date, id; NULLs primeiro como no ORDER BY)
+DROP INDEX IF EXISTS idx_articles_date;
+CREATE INDEX IF NOT EXISTS idx_articles_listing ON articles(publication_date DESC NULLS FIRST, id DESC);
+
+-- Função para avisar o tradutor (LISTEN) sobre artigos novos com texto completo;
+-- o canal é o argumento do trigger
+CREATE OR REPLACE FUNCTION notify_article_pending()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify(TG_ARGV[0], NEW.id);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- Trigger para a tabela articles. O canal deve ser o mesmo ARTICLES_CHANNEL do tradutor
+-- (ai_translator/src/config.py) e do scraper (paper_scraper/modules/config.py)
+DROP TRIGGER IF EXISTS notify_articles_pending ON articles;
+CREATE TRIGGER notify_articles_pending
+    AFTER INSERT ON articles
+    FOR EACH ROW
+    WHEN (NEW.full_text IS NOT NULL)
+    EXECUTE FUNCTION notify_article_pending('articles_pending');
+
+-- Função para invalidar o cache de respostas da API (LISTEN cache_invalidation); o payload é a tabela alterada,
+-- seguida de ':' e da coluna passada como argumento em triggers por linha (ex.: users:<id>)
+CREATE OR REPLACE FUNCTION notify_cache_invalidation()
+RETURNS TRIGGER AS $$
+DECLARE
+    payload TEXT := TG_TABLE_NAME;
+BEGIN
+    IF TG_LEVEL = 'ROW' AND TG_NARGS > 0 THEN
+        IF TG_OP = 'DELETE' THEN
+            payload := payload || ':' || (to_jsonb(OLD) ->> TG_ARGV[0]);
+        ELSE
+            payload := payload || ':' || (to_jsonb(NEW) ->> TG_ARGV[0]);
+        END IF;
+    END IF;
+    PERFORM pg_notify('cache_invalidation', payload);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Artigos: só mudanças visíveis na API (status da tradução e conteúdo), não as tentativas do tradutor.
+-- Entrar ou sair dos status publicados limpa o namespace inteiro (listas e newsletter); qualquer outra
+-- mudança de status ou de conteúdo, inclusive os checkpoints de simplified_text durante a tradução,
+-- só o detalhe do artigo (payload articles:<id>), que pode estar em cache com o texto parcial
+DROP TRIGGER IF EXISTS invalidate_cache_articles_status ON articles;
+CREATE TRIGGER invalidate_cache_articles_status
+    AFTER UPDATE ON articles
+    FOR EACH ROW
+    WHEN (OLD.processing_status IS DISTINCT FROM NEW.processing_status
+          AND (OLD.processing_status IN ('translated', 'completed')
+               OR NEW.processing_status IN ('translated', 'completed')))
+    EXECUTE FUNCTION notify_cache_invalidation();
+
+DROP TRIGGER IF EXISTS invalidate_cache_articles_update ON articles;
+CREATE TRIGGER invalidate_cache_articles_update
+    AFTER UPDATE ON articles
+    FOR EACH ROW
+    WHEN ((OLD.processing_status IS DISTINCT FROM NEW.processing_status
+           AND coalesce(OLD.processing_status, '') NOT IN ('translated', 'completed')
+           AND coalesce(NEW.processing_status, '') NOT IN ('translated', 'completed'))
+          OR (OLD.processing_status IS NOT DISTINCT FROM NEW.processing_status
+              AND (OLD.simplified_text IS DISTINCT FROM NEW.simplified_text
+                   OR OLD.title IS DISTINCT FROM NEW.title
+                   OR OLD.abstract IS DISTINCT FROM NEW.abstract
+                   OR OLD.keywords IS DISTINCT FROM NEW.keywords)))
+    EXECUTE FUNCTION notify_cache_invalidation('id');
+
+DROP TRIGGER IF EXISTS invalidate_cache_articles_delete ON articles;
+CREATE TRIGGER invalidate_cache_articles_delete
+    AFTER DELETE ON articles
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_cache_invalidation();
+
+DROP TRIGGER IF EXISTS invalidate_cache_topics ON topics;
+CREATE TRIGGER invalidate_cache_topics
+    AFTER INSERT OR UPDATE OR DELETE ON topics
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_cache_invalidation();
+
+-- Perfil em cache por usuário (dados do usuário + tópicos inscritos)
+DROP TRIGGER IF EXISTS invalidate_cache_users ON users;
+CREATE TRIGGER invalidate_cache_users
+    AFTER UPDATE OR DELETE ON users
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_cache_invalidation('id');
+
+DROP TRIGGER IF EXISTS invalidate_cache_subscriptions ON subscriptions;
+CREATE TRIGGER invalidate_cache_subscriptions
+    AFTER INSERT OR UPDATE OR DELETE ON subscriptions
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_cache_invalidation('user_id');
+
+-- Article variants table (simplified text written for one profile_type)
+CREATE TABLE IF NOT EXISTS article_variants (
+    id SERIAL PRIMARY KEY,
+    article_id TEXT NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    profile_type VARCHAR(20) NOT NULL,
+    simplified_text TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_article_variant_profile UNIQUE(article_id, profile_type)
+);
+
+CREATE INDEX IF NOT EXISTS idx_article_variants_article ON article_variants(article_id);
+
+DROP TRIGGER IF EXISTS invalidate_cache_article_variants ON article_variants;
+CREATE TRIGGER invalidate_cache_article_variants
+    AFTER INSERT OR UPDATE OR DELETE ON article_variants
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_cache_invalidation();
+
+-- Vetor de busca: título (A), palavras-chave (B) e resumo (C) em inglês, texto simplificado (D) em português
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+CREATE INDEX IF NOT EXISTS idx_articles_search ON articles USING GIN(search_vector);
+
+CREATE OR REPLACE FUNCTION articles_search_vector(title TEXT, keywords TEXT[], abstract TEXT, simplified_text TEXT)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(array_to_string(keywords, ' '), '')), 'B')
+        || setweight(to_tsvector('english', coalesce(abstract, '')), 'C')
+        || setweight(to_tsvector('portuguese', coalesce(simplified_text, '')), 'D');
+$$ language 'sql' IMMUTABLE;
+
+-- Função para manter search_vector atualizado
+CREATE OR REPLACE FUNCTION update_article_search_vector()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector = articles_search_vector(NEW.title, NEW.keywords, NEW.abstract, NEW.simplified_text);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- Trigger para a tabela articles
+DROP TRIGGER IF EXISTS update_articles_search_vector ON articles;
+CREATE TRIGGER update_articles_search_vector
+    BEFORE INSERT OR UPDATE OF title, keywords, abstract, simplified_text ON articles
+    FOR EACH ROW
+    EXECUTE FUNCTION update_article_search_vector();
+
+-- Preenche os artigos gravados antes do trigger
+UPDATE articles SET search_vector = articles_search_vector(title, keywords, abstract, simplified_text)
+WHERE search_vector IS NULL;
+
+-- Busca textual ranqueada (RPC search_articles): a consulta vale em inglês ou português,
+-- e o trecho destacado só é gerado para a página retornada
+CREATE OR REPLACE FUNCTION search_articles(query TEXT, max_results INTEGER DEFAULT 20, result_offset INTEGER DEFAULT 0)
+RETURNS TABLE (
+    id TEXT,
+    title TEXT,
+    authors TEXT[],
+    publication_date DATE,
+    keywords TEXT[],
+    source_url TEXT,
+    rank REAL,
+    headline TEXT
+) AS $$
+    WITH q AS (
+        SELECT websearch_to_tsquery('english', query) AS en,
+               websearch_to_tsquery('portuguese', query) AS pt
+    ), hits AS (
+        SELECT a.id, a.title, a.authors, a.publication_date, a.keywords, a.source_url,
+               a.abstract, a.simplified_text,
+               ts_rank_cd(a.search_vector, q.en || q.pt) AS rank
+        FROM articles a, q
+        WHERE a.processing_status = 'translated'
+          AND a.search_vector @@ (q.en || q.pt)
+        ORDER BY rank DESC, a.publication_date DESC NULLS LAST, a.id
+        LIMIT max_results OFFSET result_offset
+    )
+    SELECT h.id, h.title, h.authors, h.publication_date, h.keywords, h.source_url, h.rank,
+           CASE
+               WHEN to_tsvector('portuguese', coalesce(h.simplified_text, '')) @@ q.pt
+                   THEN ts_headline('portuguese', h.simplified_text, q.pt, 'MaxFragments=2, MaxWords=30, MinWords=10')
+               ELSE ts_headline('english', coalesce(h.abstract, h.title), q.en, 'MaxFragments=2, MaxWords=30, MinWords=10')
+           END AS headline
+    FROM hits h, q
+    ORDER BY h.rank DESC, h.publication_date DESC NULLS LAST, h.id;
+$$ language 'sql' STABLE;
+
+-- Contador de curtidas: articles.like_count é atualizado na mesma transação do INSERT/DELETE em likes,
+-- então ler o total não depende de contar a tabela likes
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION update_article_like_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE articles SET like_count = like_count + 1 WHERE id = NEW.article_id;
+    ELSE
+        UPDATE articles SET like_count = like_count - 1 WHERE id = OLD.article_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Recontagem só quando o trigger é instalado: CREATE TRIGGER bloqueia escritas em likes até o fim
+-- do bloco, então nenhuma curtida fica fora da contagem nem é somada duas vezes
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger WHERE tgname = 'update_articles_like_count' AND tgrelid = 'likes'::regclass
+    ) THEN
+        CREATE TRIGGER update_articles_like_count
+            AFTER INSERT OR DELETE ON likes
+            FOR EACH ROW
+            EXECUTE FUNCTION update_article_like_count();
+
+        UPDATE articles a SET like_count = (SELECT count(*) FROM likes l WHERE l.article_id = a.id)
+        WHERE EXISTS (SELECT 1 FROM likes l WHERE l.article_id = a.id);
+    END IF;
+END;
+$$ language 'plpgsql';